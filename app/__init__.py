@@ -8,10 +8,38 @@ def create_app():
     # Register blueprints
     from app.routes.analyzer import analyzer_bp
     from app.routes.news import news_bp
+    from app.routes.vocabulary import vocabulary_bp
+    from app.routes.warmup import warmup_bp
     from app.routes.webhook import webhook_bp
 
     app.register_blueprint(analyzer_bp)
     app.register_blueprint(news_bp)
+    app.register_blueprint(vocabulary_bp)
+    app.register_blueprint(warmup_bp)
     app.register_blueprint(webhook_bp)
 
+    from app import config
+    if config.METRICS_ENABLED:
+        from app.routes.metrics import init_metrics
+        init_metrics(app)
+
+    # Load the word-frequency index once per worker instead of on the first request
+    from app.services.word_frequency import get_frequency_index
+    get_frequency_index()
+
+    # Warm the index of already saved words without blocking boot on MySQL
+    if config.DB_ENABLED:
+        from app.services.known_words import known_words_index
+        known_words_index.warm_up_async()
+
+    # SDKs and clients load on first use; optionally start them in the background right away
+    if config.WARMUP_ON_START:
+        from app.services.clients import warm_up_async
+        warm_up_async()
+
+    # Prepare the daily digest ahead of the push; run with a single worker or use scheduler_worker.py
+    if config.SCHEDULER_ENABLED:
+        from app.services.scheduler import get_scheduler
+        get_scheduler().start()
+
     return app
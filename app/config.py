@@ -25,13 +25,45 @@ except ImportError:
 APP_HOST = os.getenv("APP_HOST", "127.0.0.1")
 APP_PORT = int(os.getenv("APP_PORT", 8080))
 APP_ANALYZER_KEY = os.getenv("APP_ANALYZER_KEY")
+# Serve Prometheus metrics on /metrics; off by default because the service is public
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").upper() == "TRUE"
+# Bearer token /metrics requires when set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Create the OpenAI, LINE, scraper and MySQL clients in the background at boot instead of on first use
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "False").upper() == "TRUE"
 
 # news
 NEWS_SCRAPER_TYPE = os.getenv("NEWS_SCRAPER_TYPE")
 NEWS_REQUEST_URL = os.getenv("NEWS_REQUEST_URL")
+# Comma-separated "type=url" list; overrides NEWS_SCRAPER_TYPE/NEWS_REQUEST_URL when set
+NEWS_SOURCES = os.getenv("NEWS_SOURCES")
+NEWS_SCRAPER_TIMEOUT = float(os.getenv("NEWS_SCRAPER_TIMEOUT", 20))
+SCRAPER_ARTICLE_WORKERS = int(os.getenv("SCRAPER_ARTICLE_WORKERS", 4))
+SCRAPER_HTTP_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", 10))
+SCRAPER_HTTP_RETRIES = int(os.getenv("SCRAPER_HTTP_RETRIES", 3))
+SCRAPER_HTTP_POOL_SIZE = int(os.getenv("SCRAPER_HTTP_POOL_SIZE", 10))
+SCRAPER_HTTP_CACHE_SIZE = int(os.getenv("SCRAPER_HTTP_CACHE_SIZE", 64))
+SEEN_ARTICLES_SYNC_INTERVAL = float(os.getenv("SEEN_ARTICLES_SYNC_INTERVAL", 60))
 LINE_ACCESS_TOKEN = os.getenv("LINE_ACCESS_TOKEN")
 LINE_USER_ID = os.getenv("LINE_USER_ID")
 LINE_CHANNEL_SECRET = os.getenv("LINE_CHANNEL_SECRET")
+# Messaging API base URL; only changed to point at a stand-in server, e.g. in benchmarks
+LINE_API_ENDPOINT = os.getenv("LINE_API_ENDPOINT", "https://api.line.me")
+LINE_WORKER_THREADS = int(os.getenv("LINE_WORKER_THREADS", 4))
+LINE_EVENT_QUEUE_SIZE = int(os.getenv("LINE_EVENT_QUEUE_SIZE", 100))
+# "flex" renders vocabularies as carousels, "text" as one plain-text list
+LINE_MESSAGE_FORMAT = os.getenv("LINE_MESSAGE_FORMAT", "flex").lower()
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", 4))
+FANOUT_RETRIES = int(os.getenv("FANOUT_RETRIES", 3))
+
+# scheduler
+# Run the in-process scheduler that prepares (and optionally pushes) the daily digest
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "False").upper() == "TRUE"
+SCHEDULER_AUTO_PUSH = os.getenv("SCHEDULER_AUTO_PUSH", "False").upper() == "TRUE"
+NEWS_PUSH_TIME = os.getenv("NEWS_PUSH_TIME", "08:00")
+NEWS_PUSH_TIMEZONE = os.getenv("NEWS_PUSH_TIMEZONE", "UTC")
+NEWS_PRECOMPUTE_LEAD_MINUTES = int(os.getenv("NEWS_PRECOMPUTE_LEAD_MINUTES", 30))
+NEWS_DIGEST_MAX_AGE = float(os.getenv("NEWS_DIGEST_MAX_AGE", 6 * 3600))
 
 # mysql
 MYSQL_HOST = os.getenv("MYSQL_HOST")
@@ -39,7 +71,46 @@ MYSQL_PORT = int(os.getenv("MYSQL_PORT", 3306))
 MYSQL_USERNAME = os.getenv("MYSQL_USERNAME")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 MYSQL_DBNAME = os.getenv("MYSQL_DBNAME")
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", 8))
+MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", 10))
+MYSQL_POOL_MAX_IDLE = float(os.getenv("MYSQL_POOL_MAX_IDLE", 300))
 
 # openai
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_LANG_MODEL = os.getenv("OPENAI_LANG_MODEL")
\ No newline at end of file
+OPENAI_LANG_MODEL = os.getenv("OPENAI_LANG_MODEL")
+OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", 500))
+OPENAI_TOKENS_PER_MINUTE = float(os.getenv("OPENAI_TOKENS_PER_MINUTE", 200000))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 60))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 4))
+# Seconds one call may take in total, rate-limit waits and retries included
+OPENAI_CALL_DEADLINE = float(os.getenv("OPENAI_CALL_DEADLINE", 90))
+OPENAI_EXPECTED_COMPLETION_TOKENS = int(os.getenv("OPENAI_EXPECTED_COMPLETION_TOKENS", 800))
+
+# vocabulary cache
+VOCA_CACHE_SIZE = int(os.getenv("VOCA_CACHE_SIZE", 512))
+VOCA_CACHE_TTL = int(os.getenv("VOCA_CACHE_TTL", 7 * 24 * 3600))
+VOCA_CACHE_SQLITE_PATH = os.getenv("VOCA_CACHE_SQLITE_PATH")
+
+# vocabulary extraction
+VOCA_CHUNK_CHARS = int(os.getenv("VOCA_CHUNK_CHARS", 3000))
+VOCA_CHUNK_WORKERS = int(os.getenv("VOCA_CHUNK_WORKERS", 4))
+# Follow-up requests for items missing from a truncated or partly invalid reply
+VOCA_REPAIR_ATTEMPTS = int(os.getenv("VOCA_REPAIR_ATTEMPTS", 1))
+
+# database features
+# Set DB_ENABLED=False to run without MySQL (nothing is saved or looked up)
+DB_ENABLED = os.getenv("DB_ENABLED", "True").upper() == "TRUE"
+KNOWN_WORDS_SYNC_INTERVAL = float(os.getenv("KNOWN_WORDS_SYNC_INTERVAL", 60))
+
+# conversation memory
+CONVERSATION_MAX_USERS = int(os.getenv("CONVERSATION_MAX_USERS", 1000))
+CONVERSATION_MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", 10))
+CONVERSATION_TTL = float(os.getenv("CONVERSATION_TTL", 3600))
+CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", 2000))
+# Keep conversations in MySQL as well (requires DB_ENABLED)
+CONVERSATION_PERSIST = os.getenv("CONVERSATION_PERSIST", "False").upper() == "TRUE"
+
+# batch vocabulary generation
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+BATCH_REQUESTS_PER_MINUTE = float(os.getenv("BATCH_REQUESTS_PER_MINUTE", 60))
+BATCH_MAX_ARTICLES = int(os.getenv("BATCH_MAX_ARTICLES", 50))
\ No newline at end of file
@@ -1 +1,4 @@
-GENERATE_VOCA = "Generate Voca"
\ No newline at end of file
+GENERATE_VOCA = "Generate Voca"
+HELP = "/help"
+RESET = "/reset"
+NEWS = "/news"
@@ -0,0 +1,214 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+import pymysql
+from app import config
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection could be checked out before the timeout"""
+
+
+class _PooledConnection:
+    """A pymysql connection plus the bookkeeping the pool needs"""
+
+    def __init__(self, con: pymysql.Connection):
+        self.con = con
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of long-lived MySQL connections.
+
+    Connections are created lazily up to `size`, health-checked on checkout,
+    closed when they have been idle longer than `max_idle` seconds and
+    transparently replaced when they turn out to be broken.
+    """
+
+    def __init__(
+        self,
+        size: int = 5,
+        timeout: float = 10.0,
+        max_idle: float = 300.0,
+        ping_interval: float = 30.0,
+    ):
+        """
+        Args:
+            size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before giving up
+            max_idle: Seconds a connection may sit unused before it is recycled
+            ping_interval: Connections used more recently than this skip the ping health check
+        """
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.ping_interval = ping_interval
+
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._in_use = 0
+        self._opened = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _create(self) -> _PooledConnection:
+        con = pymysql.Connection(
+            host=config.MYSQL_HOST,
+            port=int(config.MYSQL_PORT),
+            user=config.MYSQL_USERNAME,
+            password=config.MYSQL_PASSWORD,
+            database=config.MYSQL_DBNAME,
+            charset="utf8mb4",
+            cursorclass=pymysql.cursors.DictCursor,
+        )
+        with self._lock:
+            self._opened += 1
+        return _PooledConnection(con)
+
+    @staticmethod
+    def _close(pooled: _PooledConnection):
+        try:
+            pooled.con.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        idle_for = now - pooled.last_used
+
+        if idle_for > self.max_idle:
+            return False
+        if idle_for < self.ping_interval:
+            return True
+        try:
+            pooled.con.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def checkout(self) -> pymysql.Connection:
+        """
+        Borrow a connection from the pool.
+
+        Returns:
+            An open pymysql connection; hand it back with `release`
+
+        Raises:
+            PoolExhaustedError: If every connection stayed busy for `timeout` seconds
+        """
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolExhaustedError(
+                f"No MySQL connection available after {self.timeout}s (pool size {self.size})"
+            )
+
+        try:
+            pooled = None
+            while pooled is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    pooled = self._create()
+                    break
+
+                if self._is_healthy(candidate):
+                    pooled = candidate
+                else:
+                    logging.info("Recycling stale MySQL connection")
+                    self._close(candidate)
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        pooled.con._pool_entry = pooled
+        return pooled.con
+
+    def release(self, con: pymysql.Connection, discard: bool = False):
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back first. Broken connections, or
+        connections released with `discard=True`, are closed instead of reused.
+
+        Args:
+            con: Connection previously obtained from `checkout`
+            discard: Close the connection instead of returning it
+        """
+        pooled = getattr(con, "_pool_entry", None) or _PooledConnection(con)
+
+        if not discard:
+            try:
+                con.rollback()
+            except Exception:
+                discard = True
+
+        if discard or not con.open:
+            self._close(pooled)
+        else:
+            pooled.last_used = time.monotonic()
+            self._idle.put(pooled)
+
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return pool metrics.
+
+        Returns:
+            Dictionary with keys: size, in_use, idle, opened, checkouts,
+            wait_avg_ms, wait_max_ms
+        """
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "opened": self._opened,
+                "checkouts": checkouts,
+                "wait_avg_ms": (self._wait_total / checkouts * 1000) if checkouts else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    size=config.MYSQL_POOL_SIZE,
+                    timeout=config.MYSQL_POOL_TIMEOUT,
+                    max_idle=config.MYSQL_POOL_MAX_IDLE,
+                )
+    return _pool
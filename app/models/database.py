@@ -1,67 +1,502 @@
+import logging
+from typing import Optional
+
 import pymysql
-from app import config
+import pymysql.cursors
+from app.models.connection_pool import get_pool
+from app.models.vocabulary import german_key
+from app.utils.metrics import track_stage
+
+# Errors that mean the connection itself is unusable and the statement can be retried on a fresh one
+RECONNECT_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
 
 
 class Database:
+    """
+    Runs statements on a connection checked out of the pool.
+
+    The connection is checked out by the first statement and given back by
+    the method that finishes the work (fetchone, fetchall, commit and the
+    save_* helpers). Code that calls `execute` directly should use the
+    instance as a context manager so the connection is returned even if it
+    never commits:
+
+        with Database() as db:
+            db.execute(...)
+            db.commit()
+    """
+
     def __init__(self):
-        self.host = config.MYSQL_HOST
-        self.port = int(config.MYSQL_PORT)
-        self.user = config.MYSQL_USERNAME
-        self.password = config.MYSQL_PASSWORD
-        self.charset = "utf8mb4",
-        self.db = config.MYSQL_DBNAME
-        self.__connect__()
+        self.pool = get_pool()
+        self.con = None
+        self.cur = None
+        # Statements run on the current connection; they are part of its open transaction
+        self._statements = 0
 
-    def __connect__(self):
-      self.con = pymysql.Connection(
-          host=self.host,
-          user=self.user,
-          password=self.password,
-          database=self.db,
-          cursorclass=pymysql.cursors.DictCursor
-      )
-      self.cur = self.con.cursor()
-
-    def __disconnect__(self):
-        self.con.close()
-
-    def fetchone(self, sql):
-        self.cur.execute(sql)
-        result = self.cur.fetchone()
-        self.__disconnect__()
-        return result
+    def __enter__(self):
+        return self
 
-    def fetchall(self, sql):
-        self.cur.execute(sql)
-        result = self.cur.fetchall()
+    def __exit__(self, exc_type, exc, tb):
         self.__disconnect__()
-        return result
 
-    def execute(self, sql):
-        self.cur.execute(sql)
+    def __connect__(self):
+        with track_stage("db.checkout"):
+            self.con = self.pool.checkout()
+        self.cur = self.con.cursor()
+        self._statements = 0
+
+    def __disconnect__(self, discard: bool = False):
+        if self.con is None:
+            return
+        try:
+            self.cur.close()
+        except Exception:
+            pass
+        self.pool.release(self.con, discard=discard)
+        self.con = None
+        self.cur = None
+        self._statements = 0
+
+    def __reconnect__(self):
+        self.__disconnect__(discard=True)
+        self.__connect__()
+
+    def _run(self, run):
+        """
+        Run `run(cursor)`, reconnecting once if the pooled connection has gone away.
+
+        The statement is only replayed when it was the first one on the
+        connection. Earlier statements of the transaction are lost with the
+        connection, so replaying just the last one would commit half of it.
+        """
+        if self.con is None:
+            self.__connect__()
+        try:
+            run(self.cur)
+        except RECONNECT_ERRORS as e:
+            if self._statements:
+                self.__disconnect__(discard=True)
+                raise
+            logging.warning(f"MySQL connection lost ({e}), reconnecting")
+            self.__reconnect__()
+            run(self.cur)
+        self._statements += 1
+
+    def _execute(self, sql, args=None):
+        with track_stage("db.execute"):
+            self._run(lambda cur: cur.execute(sql, args))
+
+    def _executemany(self, sql, rows: list):
+        with track_stage("db.executemany"):
+            self._run(lambda cur: cur.executemany(sql, rows))
+
+    def fetchone(self, sql, args=None):
+        try:
+            self._execute(sql, args)
+            return self.cur.fetchone()
+        finally:
+            self.__disconnect__()
+
+    def fetchall(self, sql, args=None):
+        try:
+            self._execute(sql, args)
+            return self.cur.fetchall()
+        finally:
+            self.__disconnect__()
+
+    def execute(self, sql, args=None):
+        self._execute(sql, args)
 
     def commit(self):
-        self.con.commit()
-        self.__disconnect__()
+        if self.con is None:
+            return
+        try:
+            self.con.commit()
+        finally:
+            self.__disconnect__()
 
     def save_vocabularies(self, vocabularies: list):
         """
-        Save vocabularies to database.
+        Save vocabularies to database in a single round trip.
+
+        A word that is already stored keeps its first translations and sentence:
+        the unique `german` key turns the insert into a no-op for it. Callers
+        normally drop known words beforehand (see known_words_index); the key
+        covers words saved by another worker since its last sync. Words are
+        compared exactly, like the key does (see german_key).
 
         Args:
-            article_id: The article ID to associate vocabularies with
             vocabularies: List of vocabulary dictionaries with keys: german, english, chinese, sentence
         """
-        sql = """INSERT INTO vocabularies (german, english, chinese, sentence)
-                 VALUES (%s, %s, %s, %s)"""
-
+        # Deduplicate within the batch as well; the first occurrence wins like it does in the DB
+        rows = {}
         for vocab in vocabularies:
-            self.cur.execute(sql, (
-                vocab.get('german', ''),
+            german = german_key(vocab.get('german'))
+            if not german or german in rows:
+                continue
+            rows[german] = (
+                german,
                 vocab.get('english', ''),
                 vocab.get('chinese', ''),
                 vocab.get('sentence', '')
-            ))
+            )
+
+        if not rows:
+            return
+
+        # pymysql rewrites executemany on an INSERT ... VALUES statement into one multi-row INSERT
+        sql = """INSERT INTO vocabularies (german, english, chinese, sentence)
+                 VALUES (%s, %s, %s, %s)
+                 ON DUPLICATE KEY UPDATE id = id"""
+
+        try:
+            self._executemany(sql, list(rows.values()))
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def fetch_vocabulary_words(self, after_id: int = 0) -> list:
+        """
+        Fetch the German word of every vocabulary row with an id above `after_id`.
+
+        Args:
+            after_id: Only rows with a larger id are returned
+
+        Returns:
+            List of dictionaries with keys: id, german; ordered by id
+        """
+        return self.fetchall(
+            "SELECT id, german FROM vocabularies WHERE id > %s ORDER BY id",
+            (after_id,)
+        )
+
+    def find_vocabulary(self, german: str):
+        """
+        Look up one saved vocabulary by its German word (uses the unique index on `german`).
+
+        Args:
+            german: The German word; matched exactly, including case
+
+        Returns:
+            Dictionary with keys: german, english, chinese, sentence; None if not saved
+        """
+        return self.fetchone(
+            "SELECT german, english, chinese, sentence FROM vocabularies WHERE german = %s LIMIT 1",
+            (german_key(german),)
+        )
+
+    def fetch_active_subscribers(self) -> list:
+        """
+        Fetch the LINE user IDs of all active subscribers.
+
+        Returns:
+            List of user ID strings
+        """
+        rows = self.fetchall("SELECT user_id FROM subscribers WHERE active = 1 ORDER BY user_id")
+        return [row["user_id"] for row in rows]
+
+    def set_subscriber(self, user_id: str, active: bool = True):
+        """
+        Subscribe or unsubscribe a LINE user.
+
+        Args:
+            user_id: LINE user ID
+            active: False to unsubscribe
+        """
+        try:
+            self._execute(
+                """INSERT INTO subscribers (user_id, active) VALUES (%s, %s)
+                   ON DUPLICATE KEY UPDATE active = VALUES(active)""",
+                (user_id, int(active))
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def save_deliveries(self, batch_id: str, deliveries: list):
+        """
+        Record the delivery status of every recipient of a fan-out.
+
+        Args:
+            batch_id: Identifier shared by all deliveries of one fan-out
+            deliveries: List of (user_id, status, error) tuples
+        """
+        if not deliveries:
+            return
+        try:
+            self._executemany(
+                """INSERT INTO deliveries (batch_id, user_id, status, error)
+                   VALUES (%s, %s, %s, %s)""",
+                [(batch_id, user_id, status, error) for user_id, status, error in deliveries]
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def save_digest(self, digest_date: str, payload: str):
+        """
+        Store the pre-computed news digest for a day, replacing an older one.
+
+        Args:
+            digest_date: Day the digest is for, as YYYY-MM-DD
+            payload: Digest serialized as JSON
+        """
+        try:
+            self._execute(
+                """INSERT INTO news_digests (digest_date, payload) VALUES (%s, %s)
+                   ON DUPLICATE KEY UPDATE payload = VALUES(payload)""",
+                (digest_date, payload)
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def fetch_latest_digest(self):
+        """
+        Fetch the most recently stored news digest.
+
+        Returns:
+            Dictionary with keys: digest_date, payload; None if there is none
+        """
+        return self.fetchone(
+            "SELECT digest_date, payload FROM news_digests ORDER BY updated_at DESC LIMIT 1"
+        )
+
+    def fetch_seen_articles(self, updated_since=None) -> list:
+        """
+        Fetch seen articles, optionally only those changed since a point in time.
 
-        self.con.commit()
-        self.__disconnect__()
\ No newline at end of file
+        Args:
+            updated_since: datetime of the last sync; None fetches every row
+
+        Returns:
+            List of dictionaries with keys: url, teaser_hash, content_hash, pushed, updated_at
+        """
+        sql = "SELECT url, teaser_hash, content_hash, pushed, updated_at FROM seen_articles"
+        if updated_since is None:
+            return self.fetchall(sql)
+        # >= so rows written in the same second as the last sync are not missed
+        return self.fetchall(sql + " WHERE updated_at >= %s", (updated_since,))
+
+    def save_seen_article(self, url: str, teaser_hash: str, content_hash, pushed: bool):
+        """
+        Insert or update the hashes and pushed state of an article.
+
+        Args:
+            url: Article URL
+            teaser_hash: Hash of the teaser headline and link
+            content_hash: Hash of the article body, None if unknown
+            pushed: Whether the article has been sent to subscribers
+        """
+        try:
+            self._execute(
+                """INSERT INTO seen_articles (url_hash, url, teaser_hash, content_hash, pushed)
+                   VALUES (SHA2(%s, 256), %s, %s, %s, %s)
+                   ON DUPLICATE KEY UPDATE teaser_hash = VALUES(teaser_hash),
+                       content_hash = VALUES(content_hash), pushed = VALUES(pushed)""",
+                (url, url, teaser_hash, content_hash, int(pushed))
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def fetch_conversation_turns(self, user_id: str, limit: int, max_age: float) -> list:
+        """
+        Fetch a user's most recent question/answer pairs.
+
+        Args:
+            user_id: LINE user ID
+            limit: Maximum number of turns
+            max_age: Only turns from the last `max_age` seconds are returned
+
+        Returns:
+            List of (question, answer) tuples, oldest first
+        """
+        rows = self.fetchall(
+            """SELECT question, answer FROM conversation_messages
+               WHERE user_id = %s AND created_at >= NOW() - INTERVAL %s SECOND
+               ORDER BY id DESC LIMIT %s""",
+            (user_id, int(max_age), limit)
+        )
+        return [(row["question"], row["answer"]) for row in reversed(rows)]
+
+    def save_conversation_turn(self, user_id: str, question: str, answer: str):
+        """
+        Store one question/answer pair of a conversation.
+
+        Args:
+            user_id: LINE user ID
+            question: The user's message
+            answer: The bot's reply
+        """
+        try:
+            self._execute(
+                "INSERT INTO conversation_messages (user_id, question, answer) VALUES (%s, %s, %s)",
+                (user_id, question, answer)
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def delete_conversation_turns(self, user_id: str):
+        """
+        Delete every stored turn of a user's conversation.
+
+        Args:
+            user_id: LINE user ID
+        """
+        try:
+            self._execute("DELETE FROM conversation_messages WHERE user_id = %s", (user_id,))
+            self.con.commit()
+        finally:
+            self.__disconnect__()
+
+    def fetch_vocabularies_page(self, after_id: int = 0, limit: int = 50) -> list:
+        """
+        Fetch one keyset page of vocabularies ordered by id.
+
+        Args:
+            after_id: Only rows with a larger id are returned
+            limit: Page size
+
+        Returns:
+            List of dictionaries with keys: id, german, english, chinese, sentence
+        """
+        return self.fetchall(
+            """SELECT id, german, english, chinese, sentence FROM vocabularies
+               WHERE id > %s ORDER BY id LIMIT %s""",
+            (after_id, limit)
+        )
+
+    def fetch_vocabularies_by_prefix(self, prefix: str, after_german: str = "", limit: int = 50) -> list:
+        """
+        Fetch one keyset page of vocabularies whose German word starts with `prefix`.
+
+        Walks the unique index on `german`, ordered by the word itself. The
+        column is case-sensitive, so "haus" does not match "Haus".
+
+        Args:
+            prefix: Start of the German word
+            after_german: Only words sorting after this one are returned
+            limit: Page size
+
+        Returns:
+            List of dictionaries with keys: id, german, english, chinese, sentence
+        """
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self.fetchall(
+            """SELECT id, german, english, chinese, sentence FROM vocabularies
+               WHERE german LIKE %s AND german > %s ORDER BY german LIMIT %s""",
+            (pattern, after_german, limit)
+        )
+
+    def fetch_vocabularies_matching(self, query: str, after_id: int = 0, limit: int = 50) -> list:
+        """
+        Fetch one keyset page of vocabularies matching a full-text query on german, english or chinese.
+
+        Each column has its own full-text index; german matches are
+        case-sensitive and chinese is indexed as n-grams. Words shorter than
+        innodb_ft_min_token_size are not indexed (see the README).
+
+        Args:
+            query: Search terms (boolean mode, e.g. "haus*")
+            after_id: Only rows with a larger id are returned
+            limit: Page size
+
+        Returns:
+            List of dictionaries with keys: id, german, english, chinese, sentence
+        """
+        return self.fetchall(
+            """SELECT id, german, english, chinese, sentence FROM vocabularies
+               WHERE (MATCH (german) AGAINST (%s IN BOOLEAN MODE)
+                      OR MATCH (english) AGAINST (%s IN BOOLEAN MODE)
+                      OR MATCH (chinese) AGAINST (%s IN BOOLEAN MODE))
+                 AND id > %s
+               ORDER BY id LIMIT %s""",
+            (query, query, query, after_id, limit)
+        )
+
+    def fetch_due_reviews(self, user_id: str, after: Optional[tuple] = None, limit: int = 50) -> list:
+        """
+        Fetch one keyset page of a user's words that are due for review, most overdue first.
+
+        Args:
+            user_id: LINE user ID
+            after: (due_at, vocabulary_id) of the last row of the previous page
+            limit: Page size
+
+        Returns:
+            List of dictionaries with keys: id, german, english, chinese, sentence,
+            due_at, repetitions, interval_days
+        """
+        sql = """SELECT v.id, v.german, v.english, v.chinese, v.sentence,
+                        r.due_at, r.repetitions, r.interval_days
+                 FROM vocabulary_reviews r
+                 JOIN vocabularies v ON v.id = r.vocabulary_id
+                 WHERE r.user_id = %s AND r.due_at <= NOW()"""
+        args = [user_id]
+        if after:
+            sql += " AND (r.due_at, r.vocabulary_id) > (%s, %s)"
+            args.extend(after)
+        sql += " ORDER BY r.due_at, r.vocabulary_id LIMIT %s"
+        args.append(limit)
+        return self.fetchall(sql, args)
+
+    def fetch_unreviewed_vocabularies(self, user_id: str, after_id: int = 0, limit: int = 50) -> list:
+        """
+        Fetch one keyset page of words the user has never reviewed.
+
+        Args:
+            user_id: LINE user ID
+            after_id: Only rows with a larger id are returned
+            limit: Page size
+
+        Returns:
+            List of dictionaries with keys: id, german, english, chinese, sentence
+        """
+        return self.fetchall(
+            """SELECT v.id, v.german, v.english, v.chinese, v.sentence
+               FROM vocabularies v
+               LEFT JOIN vocabulary_reviews r ON r.user_id = %s AND r.vocabulary_id = v.id
+               WHERE r.vocabulary_id IS NULL AND v.id > %s
+               ORDER BY v.id LIMIT %s""",
+            (user_id, after_id, limit)
+        )
+
+    def fetch_review(self, user_id: str, vocabulary_id: int):
+        """
+        Fetch the review state of one word for a user.
+
+        Returns:
+            Dictionary with keys: repetitions, interval_days, ease_factor; None if never reviewed
+        """
+        return self.fetchone(
+            """SELECT repetitions, interval_days, ease_factor FROM vocabulary_reviews
+               WHERE user_id = %s AND vocabulary_id = %s""",
+            (user_id, vocabulary_id)
+        )
+
+    def save_review(self, user_id: str, vocabulary_id: int, repetitions: int, interval_days: int, ease_factor: float):
+        """
+        Store the new review state of a word; it becomes due again after `interval_days`.
+
+        Args:
+            user_id: LINE user ID
+            vocabulary_id: Reviewed vocabulary
+            repetitions: Consecutive successful reviews
+            interval_days: Days until the next review
+            ease_factor: SM-2 ease factor
+        """
+        try:
+            self._execute(
+                """INSERT INTO vocabulary_reviews
+                       (user_id, vocabulary_id, repetitions, interval_days, ease_factor, due_at, last_reviewed_at)
+                   VALUES (%s, %s, %s, %s, %s, NOW() + INTERVAL %s DAY, NOW())
+                   ON DUPLICATE KEY UPDATE repetitions = VALUES(repetitions),
+                       interval_days = VALUES(interval_days), ease_factor = VALUES(ease_factor),
+                       due_at = VALUES(due_at), last_reviewed_at = VALUES(last_reviewed_at)""",
+                (user_id, vocabulary_id, repetitions, interval_days, ease_factor, interval_days)
+            )
+            self.con.commit()
+        finally:
+            self.__disconnect__()
@@ -0,0 +1,37 @@
+import unicodedata
+
+ARTICLES = ("der", "die", "das")
+
+
+def german_key(word: str) -> str:
+    """
+    Return the form of a German word that the unique key on `vocabularies.german` compares.
+
+    The column uses the utf8mb4_bin collation, so words that differ only in
+    case or accents (Zahlen/zahlen, schon/schön) are different words. Only
+    surrounding whitespace and Unicode composition are normalized, and words
+    are stored in this form.
+
+    Args:
+        word: German word as written by the model or the user
+
+    Returns:
+        The normalized word; empty if there is no word
+    """
+    return unicodedata.normalize("NFC", (word or "").strip())
+
+
+def strip_article(word: str) -> str:
+    """
+    Drop a leading definite article, which the model puts in front of nouns.
+
+    Args:
+        word: German word, e.g. "die Energiewende"
+
+    Returns:
+        The word without its article, e.g. "Energiewende"; other words unchanged
+    """
+    article, _, rest = word.partition(" ")
+    if rest.strip() and article.lower() in ARTICLES:
+        return rest.strip()
+    return word
@@ -1,12 +1,15 @@
+import json
 import logging
 import traceback
 import os
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from functools import wraps
 
-from app.services.openai_service import ask_question
+from app.services.openai_service import ask_question, stream_question
+from app import config
 from app.services.analyzer import gen_and_save_vocabularies
+from app.services.batch_job import BatchJob, parse_articles
 
 from app.utils.response_format import success_response, error_response
 
@@ -48,16 +51,25 @@ def get_article():
 
         messages = [{"role": "user", "content": text}]
 
+        # Stream tokens as server-sent events when the client asks for it
+        wants_stream = body.get("stream") is True or "text/event-stream" in request.headers.get("Accept", "")
+        if wants_stream:
+            return Response(
+                stream_with_context(_sse_answer(messages)),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
         # Call GPT
         gpt_result = ask_question(messages)
 
-        if not gpt_result or "choices" not in gpt_result:
+        if not gpt_result or not isinstance(gpt_result, str):
             error_msg = "Invalid response from OpenAI"
             logging.error(error_msg)
             return error_response(error_msg, 500, "AI_ERROR")
 
         return success_response(
-            data={"response": gpt_result["choices"][0]["message"]["content"]},
+            data={"response": gpt_result},
             message="Question answered successfully",
         )
 
@@ -72,6 +84,45 @@ def get_article():
         )
     
 
+def _sse_event(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_answer(messages: list):
+    """
+    Yield the answer as server-sent events.
+
+    Every token is sent as a `data: {"token": ...}` event. The stream ends with
+    an `event: done` carrying the full response, or an `event: error` that uses
+    the same fields as error_response.
+    """
+    parts = []
+    try:
+        for token in stream_question(messages):
+            parts.append(token)
+            yield _sse_event({"token": token})
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        yield _sse_event(
+            {"success": False, "message": "Invalid response from OpenAI", "error_code": "AI_ERROR", "details": str(e)},
+            event="error",
+        )
+        return
+
+    if not parts:
+        yield _sse_event(
+            {"success": False, "message": "Invalid response from OpenAI", "error_code": "AI_ERROR"},
+            event="error",
+        )
+        return
+
+    yield _sse_event(
+        {"success": True, "message": "Question answered successfully", "data": {"response": "".join(parts)}},
+        event="done",
+    )
+
+
 # For directly accessing Bot for generating vocabularies
 @analyzer_bp.route("/gen_voca", methods=["POST"])
 @feature_flag_check
@@ -124,6 +175,53 @@ def generate_voca():
         )
 
 
+# For generating vocabularies for many articles in one request
+@analyzer_bp.route("/gen_voca_batch", methods=["POST"])
+@feature_flag_check
+def generate_voca_batch():
+    try:
+        analyzer_signature = request.headers.get("Analyzer-Signature")
+        if not analyzer_signature:
+            error_msg = "Missing signature headers"
+            logging.error(error_msg)
+            return error_response(error_msg, 401, "MISSING_SIGNATURE")
+
+        # Accept {"articles": [...]} or one JSON article per line
+        if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+            lines = request.get_data(as_text=True).splitlines()
+            items = [json.loads(line) for line in lines if line.strip()]
+        else:
+            body = request.get_json(silent=True)
+            if not body:
+                return error_response("Invalid JSON payload", 400, "INVALID_JSON")
+            items = body.get("articles") if isinstance(body, dict) else body
+
+        if not items or not isinstance(items, list):
+            return error_response("Missing 'articles' list", 400, "MISSING_ARTICLES")
+        if len(items) > config.BATCH_MAX_ARTICLES:
+            return error_response(
+                f"Too many articles. At most {config.BATCH_MAX_ARTICLES} per request, got {len(items)}",
+                400,
+                "TOO_MANY_ARTICLES",
+            )
+
+        job = BatchJob()
+        results = job.run(parse_articles(items))
+
+        return success_response(
+            data={"results": results, "summary": job.summary},
+            message=f"Processed {job.summary['processed']} of {len(results)} articles",
+        )
+
+    except json.JSONDecodeError:
+        return error_response("Invalid JSON line in payload", 400, "INVALID_JSON")
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return error_response(
+            "Internal server error", 500, "INTERNAL_ERROR", details=str(e)
+        )
+
+
 @analyzer_bp.route("/", methods=["GET"])
 def home():
     return "Welcome to Ginny's ChatBot"
@@ -0,0 +1,68 @@
+import hmac
+import time
+
+from flask import Blueprint, Flask, Response, g, request
+
+from app.utils.response_format import error_response
+from app.utils.metrics import HTTP_LATENCY, HTTP_REQUESTS, register_stats, registry
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def init_metrics(app: Flask):
+    """
+    Time every request and expose component stats on /metrics.
+
+    Args:
+        app: The Flask application
+    """
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            # The route pattern, not the raw path, keeps the number of series bounded
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint)
+            HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        return response
+
+    from app import config
+    from app.routes.webhook import line_event_queue
+    from app.services.conversation_store import conversation_store
+    from app.services.openai_service import inflight_requests
+    from app.services.vocabulary_cache import vocabulary_cache
+
+    register_stats("chatbot_vocabulary_cache", "Vocabulary cache counters and hit rate", vocabulary_cache.stats,
+                   counters=("hits", "persistent_hits", "misses"))
+    register_stats("chatbot_single_flight", "Coalesced OpenAI requests", inflight_requests.stats,
+                   counters=("executed", "shared"))
+    register_stats("chatbot_line_event_queue", "LINE events waiting for a worker",
+                   lambda: {"pending": line_event_queue.pending()})
+    register_stats("chatbot_conversations", "Conversations held in memory",
+                   lambda: {"users": len(conversation_store)})
+
+    if config.DB_ENABLED:
+        from app.models.connection_pool import get_pool
+        from app.services.known_words import known_words_index
+
+        register_stats("chatbot_mysql_pool", "MySQL connection pool usage", lambda: get_pool().stats(),
+                       counters=("opened", "checkouts"))
+        register_stats("chatbot_known_words", "Words in the known-words index",
+                       lambda: {"words": len(known_words_index)})
+
+    app.register_blueprint(metrics_bp)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint; with METRICS_TOKEN set, scrapers send it as a bearer token"""
+    from app import config
+    if config.METRICS_TOKEN:
+        expected = f"Bearer {config.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return error_response("Invalid metrics token", 401, "UNAUTHORIZED")
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
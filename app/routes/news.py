@@ -3,8 +3,6 @@ import traceback
 
 from flask import Blueprint
 
-from app.services.line_bot import LineBot
-from app.services.news_scraper import scrape_news
 from app.utils.response_format import success_response, error_response
 
 news_bp = Blueprint("news", __name__)
@@ -12,18 +10,24 @@ news_bp = Blueprint("news", __name__)
 
 @news_bp.route("/pushnews", methods=["GET"])
 def push_news():
-    """Scrape news and push to LINE user."""
-    try:
-        news_data = scrape_news()
+    """Send the prepared news digest to every subscriber, building it first if needed."""
+    # The scrapers load requests, bs4 and lxml; keep them out of worker boot
+    from app.services.news_digest import push_digest
 
-        if news_data is None:
-            return error_response("Failed to scrape news", 500, "SCRAPE_FAILED")
+    try:
+        result = push_digest()
 
-        linebot = LineBot()
-        linebot.send_message(news_data["title"], news_data["link"])
+        if result is None:
+            return error_response("Failed to scrape a news article that has not been pushed yet", 500, "SCRAPE_FAILED")
 
+        digest, delivery = result["digest"], result["delivery"]
         return success_response(
-            data={"message_sent": True, "title": news_data["title"]},
+            data={
+                "message_sent": delivery["sent"] > 0,
+                "title": digest["title"],
+                "vocabularies": len(digest["vocabularies"]),
+                "delivery": delivery,
+            },
             message="News pushed successfully"
         )
 
@@ -0,0 +1,212 @@
+import base64
+import json
+import logging
+import time
+import traceback
+from datetime import date, datetime
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Callable, List, Optional
+
+import pymysql
+from flask import Blueprint, request
+
+from app import config
+from app.models.database import Database
+from app.routes.analyzer import feature_flag_check
+from app.services.signature import verify_signature
+from app.services.vocabulary_review import review_vocabulary
+from app.utils.response_format import success_response, error_response
+
+vocabulary_bp = Blueprint("vocabulary", __name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Signed requests older or newer than this are rejected, so a captured signature can't be replayed later
+SIGNATURE_MAX_AGE = 300
+
+
+def encode_cursor(value: Any) -> str:
+    """Turn the keyset position of the last row into an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(value, default=str).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Any:
+    if not cursor:
+        return None
+    return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+
+
+def _page_size() -> int:
+    return max(1, min(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+
+
+def _plain(row: dict) -> dict:
+    # DATETIME and DECIMAL columns
+    return {key: str(value) if isinstance(value, (date, datetime, Decimal)) else value for key, value in row.items()}
+
+
+def page_response(rows: List[dict], limit: int, cursor_of: Callable[[dict], Any], message: str):
+    """
+    Build a success_response for one keyset page.
+
+    The rows are already fetched and the connection is back in the pool, so
+    a slow client never holds a MySQL connection.
+
+    Args:
+        rows: Rows from one of the Database.fetch_* page methods
+        limit: Page size; a full page gets a `next_cursor`
+        cursor_of: Keyset position of a row
+        message: Response message
+    """
+    next_cursor = encode_cursor(cursor_of(rows[-1])) if len(rows) == limit else None
+    return success_response(
+        data={"items": [_plain(row) for row in rows], "count": len(rows), "next_cursor": next_cursor},
+        message=message,
+    )
+
+
+def user_signature_check(get_user_id: Callable[[], Optional[str]]):
+    """
+    Require a request signed with APP_ANALYZER_KEY for the user it acts on.
+
+    The caller sends Analyzer-Timestamp (unix seconds) and Analyzer-Signature,
+    the HMAC-SHA1 of timestamp + user_id (see app/services/signature.py).
+    Only a holder of the key can read or change a user's reviews.
+
+    Args:
+        get_user_id: Returns the user_id of the current request
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not config.APP_ANALYZER_KEY:
+                logging.error("APP_ANALYZER_KEY is not set; refusing review API requests")
+                return error_response("Review API is not configured", 503, "AUTH_NOT_CONFIGURED")
+
+            user_id = get_user_id()
+            if not user_id:
+                return error_response("Missing 'user_id'", 400, "MISSING_USER_ID")
+
+            timestamp = request.headers.get("Analyzer-Timestamp", "")
+            signature = request.headers.get("Analyzer-Signature", "")
+            try:
+                fresh = abs(time.time() - int(timestamp)) <= SIGNATURE_MAX_AGE
+            except ValueError:
+                fresh = False
+            if not fresh or not verify_signature(config.APP_ANALYZER_KEY, user_id, timestamp, signature):
+                logging.warning(f"Rejected unsigned or badly signed request for {request.path}")
+                return error_response("Invalid or expired signature", 401, "INVALID_SIGNATURE")
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def _body_user_id() -> Optional[str]:
+    body = request.get_json(silent=True)
+    return body.get("user_id") if isinstance(body, dict) else None
+
+
+def _require_db():
+    if not config.DB_ENABLED:
+        return error_response("Vocabulary storage is disabled", 503, "DB_DISABLED")
+    return None
+
+
+# Browse saved vocabularies: ?limit=&cursor= plus optional ?prefix= or ?q= (full-text)
+@vocabulary_bp.route("/vocabularies", methods=["GET"])
+@feature_flag_check
+def list_vocabularies():
+    disabled = _require_db()
+    if disabled:
+        return disabled
+    try:
+        limit = _page_size()
+        after = decode_cursor(request.args.get("cursor"))
+        prefix = request.args.get("prefix", "").strip()
+        query = request.args.get("q", "").strip()
+
+        if prefix:
+            rows = Database().fetch_vocabularies_by_prefix(prefix, after or "", limit)
+            cursor_of = lambda row: row["german"]
+        elif query:
+            rows = Database().fetch_vocabularies_matching(query, after or 0, limit)
+            cursor_of = lambda row: row["id"]
+        else:
+            rows = Database().fetch_vocabularies_page(after or 0, limit)
+            cursor_of = lambda row: row["id"]
+
+        return page_response(rows, limit, cursor_of, "Vocabularies fetched successfully")
+
+    except (ValueError, TypeError):
+        return error_response("Invalid cursor", 400, "INVALID_CURSOR")
+    except pymysql.err.ProgrammingError as e:
+        # e.g. a malformed boolean-mode full-text query
+        logging.warning(f"Vocabulary query rejected: {e}")
+        return error_response("Invalid search query", 400, "INVALID_QUERY", details=str(e))
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return error_response("Internal server error", 500, "INTERNAL_ERROR", details=str(e))
+
+
+# Words due for review: ?user_id=&limit=&cursor=; ?new=true lists words never reviewed instead
+@vocabulary_bp.route("/vocabularies/due", methods=["GET"])
+@feature_flag_check
+@user_signature_check(lambda: request.args.get("user_id"))
+def due_vocabularies():
+    disabled = _require_db()
+    if disabled:
+        return disabled
+    try:
+        user_id = request.args.get("user_id")
+        if not user_id:
+            return error_response("Missing 'user_id' parameter", 400, "MISSING_USER_ID")
+
+        limit = _page_size()
+        after = decode_cursor(request.args.get("cursor"))
+
+        if request.args.get("new", "").lower() == "true":
+            rows = Database().fetch_unreviewed_vocabularies(user_id, after or 0, limit)
+            cursor_of = lambda row: row["id"]
+        else:
+            rows = Database().fetch_due_reviews(user_id, tuple(after) if after else None, limit)
+            cursor_of = lambda row: [row["due_at"], row["id"]]
+
+        return page_response(rows, limit, cursor_of, "Due vocabularies fetched successfully")
+
+    except (ValueError, TypeError):
+        return error_response("Invalid cursor", 400, "INVALID_CURSOR")
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return error_response("Internal server error", 500, "INTERNAL_ERROR", details=str(e))
+
+
+# Record a review: {"user_id": "...", "quality": 0-5}
+@vocabulary_bp.route("/vocabularies/<int:vocabulary_id>/review", methods=["POST"])
+@feature_flag_check
+@user_signature_check(_body_user_id)
+def review(vocabulary_id: int):
+    disabled = _require_db()
+    if disabled:
+        return disabled
+    try:
+        body = request.get_json(silent=True)
+        if not body:
+            return error_response("Invalid JSON payload", 400, "INVALID_JSON")
+
+        user_id = body.get("user_id")
+        quality = body.get("quality")
+        if not user_id:
+            return error_response("Missing 'user_id' field", 400, "MISSING_USER_ID")
+        if not isinstance(quality, int) or not 0 <= quality <= 5:
+            return error_response("'quality' must be an integer from 0 to 5", 400, "INVALID_QUALITY")
+
+        state = review_vocabulary(user_id, vocabulary_id, quality)
+        return success_response(data=state, message="Review recorded")
+
+    except pymysql.err.IntegrityError:
+        return error_response(f"Vocabulary {vocabulary_id} not found", 404, "NOT_FOUND")
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return error_response("Internal server error", 500, "INTERNAL_ERROR", details=str(e))
@@ -0,0 +1,24 @@
+from flask import Blueprint, request
+
+from app.services.clients import CLIENTS, warm_up
+from app.utils.response_format import success_response, error_response
+
+warmup_bp = Blueprint("warmup", __name__)
+
+
+# Point a Cloud Run startup probe (or a deploy hook) here: ?clients=openai,line limits the warm-up
+@warmup_bp.route("/warmup", methods=["GET"])
+def warmup():
+    requested = request.args.get("clients")
+    names = [name.strip() for name in requested.split(",") if name.strip()] if requested else None
+
+    unknown = [name for name in names or [] if name not in CLIENTS]
+    if unknown:
+        return error_response(
+            f"Unknown clients: {', '.join(unknown)}", 400, "UNKNOWN_CLIENT", details={"available": list(CLIENTS)}
+        )
+
+    results = warm_up(names)
+    if any(result["status"] == "failed" for result in results.values()):
+        return error_response("Some clients failed to start", 503, "WARMUP_FAILED", details=results)
+    return success_response(data=results, message="Clients ready")
@@ -1,76 +1,163 @@
 from flask import Blueprint, request
 import json
 import logging
+import time
 import traceback
+from typing import Dict, List
 
-from linebot.exceptions import InvalidSignatureError
-
+from app import config
 from app.constants.line_request_constants import GENERATE_VOCA
-from app.services.openai_service import ask_question, extract_vocabularies
-from app.services.line_bot import LineBot
-from app.utils.response_format import success_response, error_response, format_vocabularies_for_line
+from app.models.database import Database
+from app.services.conversation_store import conversation_store
+from app.services.openai_service import ask_question, extract_vocabularies, vocabulary_cache_key
+from app.services.line_bot import LineBot, get_line_bot
+from app.services.line_event_queue import LineEventQueue
+from app.services.message_router import route_message
+from app.services.vocabulary_cache import vocabulary_cache
+from app.utils.line_formatter import render_vocabulary_messages, text_messages
+from app.utils.response_format import success_response, error_response
 webhook_bp = Blueprint('webhook', __name__)
 
-def handle_line_message(message_text: str) -> str:
+# LINE reply tokens expire about a minute after the event; past this age we push instead
+REPLY_TOKEN_MAX_AGE = 50
+
+def vocabulary_reply(article_text: str) -> List[Dict]:
+    """Rendered LINE messages for an article's vocabularies, cached next to the vocabularies themselves"""
+    render_key = f"{vocabulary_cache_key(article_text)}:line:{config.LINE_MESSAGE_FORMAT}"
+    # Served from here, the request counts as a hit; on a miss extract_vocabularies counts its own lookup
+    messages = vocabulary_cache.get(render_key, count_miss=False)
+    if messages is not None:
+        return messages
+
+    vocabularies = extract_vocabularies(article_text)
+    messages = render_vocabulary_messages(vocabularies, config.LINE_MESSAGE_FORMAT)
+    if vocabularies:
+        vocabulary_cache.set(render_key, messages)
+    return messages
+
+
+def handle_line_message(message_text: str, user_id: str = None) -> List[Dict]:
     "Based on the message content, decide whether to ask a question or generate voca list"
-    
+
     if GENERATE_VOCA in message_text:
-        vocabularies_data = extract_vocabularies(message_text)
-        response_text = format_vocabularies_for_line(vocabularies_data)
-        
+        # Drop the command so the article shares its cache entry with /gen_voca and earlier requests
+        article_text = message_text.replace(GENERATE_VOCA, "", 1).lstrip(" :\n")
+        return vocabulary_reply(article_text)
+
     else:
-        response_text = ask_question(message_text) 
+        # Commands, small talk and saved words are answered without OpenAI
+        response_text = route_message(message_text, user_id)
+
+        if response_text is None:
+            if user_id:
+                # Send the user's recent conversation along, trimmed to the token budget
+                messages = conversation_store.build_messages(user_id, message_text)
+                response_text = ask_question(messages)
+                if isinstance(response_text, str):
+                    conversation_store.append(user_id, message_text, response_text)
+            else:
+                response_text = ask_question(message_text)
 
     if not isinstance(response_text, str):
         error_msg = f"Business logic returned non-string type: {type(response_text)}"
         logging.error(error_msg)
-        return "Internal service error: Invalid response format."
-    
-    return response_text
+        response_text = "Internal service error: Invalid response format."
+
+    return text_messages(response_text)
+
+
+def send_line_response(linebot: LineBot, event: dict, messages: List[Dict], received_at: float):
+    """Reply with the event's reply token, falling back to a push when the token is stale or rejected"""
+    reply_token = event.get("replyToken")
+    user_id = event.get("source", {}).get("userId")
+
+    if reply_token and time.monotonic() - received_at < REPLY_TOKEN_MAX_AGE:
+        if linebot.reply_messages(reply_token, messages) == "OK":
+            return
+
+    if not user_id:
+        logging.error("Could not deliver LINE response: reply failed and event has no userId")
+        return
+    if linebot.push_messages(user_id, messages) != "OK":
+        logging.error(f"Failed to push LINE response to {user_id}")
+
+
+def update_subscription(event: dict):
+    """Subscribe users who add the bot as a friend and unsubscribe those who block it"""
+    user_id = event.get("source", {}).get("userId")
+    if not user_id or not config.DB_ENABLED:
+        return
+    try:
+        Database().set_subscriber(user_id, active=event["type"] == "follow")
+    except Exception as e:
+        logging.error(f"Failed to update subscription for {user_id}: {e}")
+
+
+def process_line_event(event: dict, received_at: float):
+    """Worker entry point: answer a single queued LINE event"""
+    if event.get("type") in ("follow", "unfollow"):
+        update_subscription(event)
+        return
+
+    if event.get("type") != "message" or event.get("message", {}).get("type") != "text":
+        return
+
+    linebot = get_line_bot()
+    try:
+        messages = handle_line_message(event["message"]["text"], event.get("source", {}).get("userId"))
+    except Exception:
+        logging.error(f"Internal server error processing LINE message: {traceback.format_exc()}")
+        messages = text_messages("An internal error has occurred. Please try again later.")
+
+    send_line_response(linebot, event, messages, received_at)
+
+
+line_event_queue = LineEventQueue(
+    process_line_event,
+    workers=config.LINE_WORKER_THREADS,
+    maxsize=config.LINE_EVENT_QUEUE_SIZE,
+)
+
 
 @webhook_bp.route("/callback", methods=["POST"])
 def receive_message():
-    """Handle LINE bot webhook callback"""
+    """
+    Handle LINE bot webhook callback.
+
+    The signature is verified synchronously, every event is queued for the
+    worker pool and LINE gets its 200 right away, before any OpenAI call.
+    When the queue is full nothing is queued and LINE gets a 503, so it
+    redelivers the events later (webhook redelivery must be on in the
+    LINE Developers console).
+    """
+    from linebot.exceptions import InvalidSignatureError
+
     body_str = request.get_data(as_text=True)
-    
-    # Init token and text
-    reply_token = None
-    response_text = None 
-    
+
     try:
         signature = request.headers.get("X-Line-Signature")
         if not signature:
             return error_response("Missing LINE signature", 400, "MISSING_SIGNATURE")
 
-        linebot = LineBot()
-        
+        linebot = get_line_bot()
+
         linebot.handler.handle(body_str, signature)
         body = json.loads(body_str)
         events = body.get("events", [])
-        
-        if not events:
-            return "OK"
-        
-        # Usually, only one reply is needed, so just returned it
-        # For non-text messages, continue looping or end directly, returning "OK" in the end
-        for event in events:
-            if event.get("type") == "message" and event.get("message", {}).get("type") == "text":
-                
-                message_text = event["message"]["text"]
-                reply_token = event["replyToken"]
-                response_text = handle_line_message(message_text)
-                linebot.reply(reply_token, response_text)
-                
-                return success_response(
-                    data={"response": response_text},
-                    message="Question answered successfully",
-                )
+
+        if events and not line_event_queue.submit(events):
+            return error_response("Too many pending LINE events, please redeliver", 503, "QUEUE_FULL")
+
+        return success_response(
+            data={"received": len(events), "queued": len(events)},
+            message="Events accepted",
+        )
 
     except InvalidSignatureError:
         error_msg = "Invalid signature. Please check your channel access token/channel secret."
         logging.error(error_msg)
         return error_response(error_msg, 400, "INVALID_LINE_SIGNATURE")
-        
+
     except json.JSONDecodeError:
         error_msg = "Invalid JSON in request body"
         logging.error(error_msg)
@@ -78,22 +165,13 @@ def receive_message():
 
     except Exception as e:
         error_trace = traceback.format_exc()
-        logging.error(f"Internal server error processing LINE message: {error_trace}")
-        
-        if reply_token:
-            error_user_message = "An internal error has occurred. Please try again later."
-            try:
-                linebot.reply(reply_token, error_user_message)
-            except Exception as reply_error:
-                logging.error(f"Failed to send error reply: {reply_error}")
-            
+        logging.error(f"Internal server error processing LINE callback: {error_trace}")
         return error_response(
-            "Internal server error", 
-            500, 
-            "INTERNAL_ERROR", 
+            "Internal server error",
+            500,
+            "INTERNAL_ERROR",
             details=f"See logs for traceback. Exception: {str(e)}"
         )
-    return "OK"
 
 
 @webhook_bp.route("/", methods=["GET"])
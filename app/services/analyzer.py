@@ -3,10 +3,70 @@ import traceback
 
 from typing import List, Dict, Tuple
 from app.models.database import Database
+from app import config
+from app.services.known_words import known_words_index
 from app.services.openai_service import extract_vocabularies
+from app.services.word_frequency import build_candidate_text, get_frequency_index
 from app.utils.response_format import format_vocabularies_for_line
 
 
+def generate_vocabularies(text: str, level: str = "B2-C1", count: int = 10) -> List[Dict]:
+    """
+    Extract vocabularies from an article without saving them.
+
+    Candidate words are picked locally and words that are already saved are
+    skipped, so only the relevant sentences are sent to OpenAI.
+
+    Args:
+        text: The German text
+        level: Vocabulary level
+        count: Number of vocabularies to extract
+
+    Returns:
+        List of dictionaries with keys: german, english, chinese, sentence
+    """
+    # Words the user has already saved are skipped so the model spends its slots on new ones
+    candidates = [
+        (word, sentence)
+        for word, sentence in get_frequency_index().select_candidates(text, level, limit=count * 4)
+        if not known_words_index.contains(word)
+    ][:count * 3]
+
+    # Send only the candidates' sentences, not the whole article
+    if len(candidates) >= count:
+        prompt_text = build_candidate_text(candidates)
+        words = [word for word, _ in candidates]
+        logging.info(f"Prompting with {len(words)} candidates, {len(prompt_text)}/{len(text)} chars")
+    else:
+        # Too few candidates (short or non-German text); let the model see everything
+        prompt_text, words = text, None
+
+    # Extract vocabularies using OpenAI
+    # Cached under the article itself, so the LINE "Generate Voca" path shares the entry
+    return extract_vocabularies(text, level=level, count=count, candidates=words, prompt_text=prompt_text)
+
+
+def save_new_vocabularies(vocabularies: List[Dict]) -> int:
+    """
+    Save the vocabularies that are not stored yet in one bulk write.
+
+    Args:
+        vocabularies: List of vocabulary dictionaries
+
+    Returns:
+        Number of vocabularies written
+    """
+    if not config.DB_ENABLED:
+        return 0
+
+    new_vocabularies = known_words_index.filter_unknown(vocabularies)
+    if new_vocabularies:
+        logging.info("Saving to DB...")
+        Database().save_vocabularies(new_vocabularies)
+        known_words_index.add(vocab.get("german") for vocab in new_vocabularies)
+    return len(new_vocabularies)
+
+
 def gen_and_save_vocabularies(text: str) -> Tuple[List[Dict], str]:
     """
     Generate and save vocabularies: extract vocabularies from article, save to DB
@@ -20,19 +80,18 @@ def gen_and_save_vocabularies(text: str) -> Tuple[List[Dict], str]:
     try:
         logging.info("Processing text...")
 
-        # Extract vocabularies using OpenAI
-        vocabularies = extract_vocabularies(text, level="B2-C1", count=10)
+        vocabularies = generate_vocabularies(text, level="B2-C1", count=10)
 
         if not vocabularies:
             error_msg = "Sorry, I couldn't extract vocabularies from the article. Please make sure it's a German text."
             logging.warning(error_msg)
             return [], error_msg
-        
-        # Save vocabularies to database
-        logging.info("Saving to DB...")
-        db = Database()
-        db.save_vocabularies(vocabularies)
-        res_msg = f"Saved{len(vocabularies)} vocabularies"
+
+        if not config.DB_ENABLED:
+            return vocabularies, f"Generated {len(vocabularies)} vocabularies"
+
+        saved = save_new_vocabularies(vocabularies)
+        res_msg = f"Saved {saved} vocabularies"
         logging.info(res_msg)
 
         return vocabularies, res_msg
@@ -40,4 +99,4 @@ def gen_and_save_vocabularies(text: str) -> Tuple[List[Dict], str]:
     except Exception as e:
         error_msg = f"Sorry, an error occurred while generating and save vocabularies: {str(e)}"
         logging.error(error_msg)
-        return [], error_msg
\ No newline at end of file
+        return [], error_msg
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from app import config
+from app.services.analyzer import generate_vocabularies, save_new_vocabularies
+from app.services.vocabulary_cache import normalize_text
+
+
+class RateLimiter:
+    """Spaces calls evenly so that no more than `per_minute` start in any minute"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def article_id(text: str) -> str:
+    """Stable id for articles that don't bring their own, derived from the normalized text"""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()[:16]
+
+
+def parse_articles(items: Iterable) -> Iterator[Dict[str, str]]:
+    """
+    Normalize article entries to {"id", "text"} dictionaries.
+
+    Args:
+        items: Strings or dictionaries with a `text` field and an optional `id`
+
+    Yields:
+        Dictionaries with keys: id, text
+    """
+    for item in items:
+        if isinstance(item, str):
+            item = {"text": item}
+        if not isinstance(item, dict) or not item.get("text"):
+            logging.warning(f"Skipping article without text: {str(item)[:80]}")
+            continue
+        yield {"id": str(item.get("id") or article_id(item["text"])), "text": item["text"]}
+
+
+def load_articles(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Read articles from a JSON or JSONL file.
+
+    JSON files may contain a list of articles or an object with an `articles`
+    list; JSONL files contain one article per line. An article is a string or
+    an object with a `text` field and an optional `id`.
+
+    Args:
+        path: Input file path
+
+    Yields:
+        Dictionaries with keys: id, text
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl") or path.endswith(".ndjson"):
+            items = (json.loads(line) for line in f if line.strip())
+            yield from parse_articles(items)
+            return
+        data = json.load(f)
+    yield from parse_articles(data.get("articles", []) if isinstance(data, dict) else data)
+
+
+def load_progress(path: Optional[str]) -> Set[str]:
+    """Return the ids of articles recorded as done in a progress file; failed ones are retried"""
+    done = set()
+    if not path:
+        return done
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("status") == "ok":
+                        done.add(record["id"])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class BatchJob:
+    """
+    Generate vocabularies for many articles with bounded concurrency.
+
+    Articles are processed by `concurrency` threads, with OpenAI calls paced by
+    a RateLimiter and failed articles retried with exponential backoff.
+    Vocabularies are written to MySQL in bulk every `flush_size` words, and
+    only after a flush are the articles written to the output file and
+    recorded in the progress file, so an interrupted run can be resumed
+    without losing or repeating work.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        requests_per_minute: float = None,
+        retries: int = 3,
+        flush_size: int = 200,
+        progress_path: Optional[str] = None,
+        output_path: Optional[str] = None,
+        keep_results: bool = True,
+    ):
+        """
+        Args:
+            concurrency: Articles processed at once; defaults to BATCH_CONCURRENCY
+            requests_per_minute: Pacing for article starts; defaults to BATCH_REQUESTS_PER_MINUTE
+            retries: Retries for an article that produced no vocabularies
+            flush_size: Buffered vocabularies that trigger a bulk DB write
+            progress_path: JSONL file recording finished article ids
+            output_path: JSONL file receiving each article's vocabularies
+            keep_results: Return per-article results from `run`; disable for large corpora
+        """
+        self.concurrency = concurrency or config.BATCH_CONCURRENCY
+        self.limiter = RateLimiter(requests_per_minute or config.BATCH_REQUESTS_PER_MINUTE)
+        self.retries = retries
+        self.flush_size = flush_size
+        self.progress_path = progress_path
+        self.output_path = output_path
+        self.keep_results = keep_results
+
+        self._buffer: List[Dict] = []
+        self._outputs: List[Dict] = []
+        self._pending: List[Dict] = []
+        self.summary = {"processed": 0, "skipped": 0, "failed": 0, "vocabularies": 0, "saved": 0}
+
+    def _process(self, article: Dict[str, str]) -> Dict:
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                vocabularies = generate_vocabularies(article["text"])
+            except Exception as e:
+                logging.error(f"Article {article['id']} failed: {e}")
+                vocabularies = []
+            if vocabularies:
+                return {"id": article["id"], "status": "ok", "vocabularies": vocabularies}
+            if attempt < self.retries:
+                # Empty results are usually rate limiting or a transient API error
+                time.sleep(min(60, 2 ** attempt))
+        return {"id": article["id"], "status": "failed", "vocabularies": []}
+
+    def _append(self, path: Optional[str], records: List[Dict]):
+        if not path or not records:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _flush(self):
+        if self._buffer:
+            self.summary["saved"] += save_new_vocabularies(self._buffer)
+        # Output first: a crash in between repeats an output line on resume instead of losing it
+        self._append(self.output_path, self._outputs)
+        self._append(self.progress_path, self._pending)
+        self._buffer = []
+        self._outputs = []
+        self._pending = []
+
+    def _collect(self, result: Dict, results: List[Dict]):
+        if result["status"] == "ok":
+            self.summary["processed"] += 1
+        else:
+            self.summary["failed"] += 1
+        self.summary["vocabularies"] += len(result["vocabularies"])
+
+        if self.output_path:
+            self._outputs.append(result)
+        if self.keep_results:
+            results.append(result)
+        self._buffer.extend(result["vocabularies"])
+        self._pending.append({"id": result["id"], "status": result["status"], "count": len(result["vocabularies"])})
+        if len(self._buffer) >= self.flush_size:
+            self._flush()
+
+    def run(self, articles: Iterable[Dict[str, str]]) -> List[Dict]:
+        """
+        Process articles, skipping those already recorded in the progress file.
+
+        Args:
+            articles: Dictionaries with keys: id, text
+
+        Returns:
+            Per-article results with keys: id, status, vocabularies (empty if keep_results is off)
+        """
+        done = load_progress(self.progress_path)
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as executor:
+            in_flight = set()
+            try:
+                for article in articles:
+                    if article["id"] in done:
+                        self.summary["skipped"] += 1
+                        continue
+                    # Keep the submission window small so huge inputs are streamed, not loaded up front
+                    if len(in_flight) >= self.concurrency * 2:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            self._collect(future.result(), results)
+                    in_flight.add(executor.submit(self._process, article))
+
+                for future in wait(in_flight).done:
+                    self._collect(future.result(), results)
+            finally:
+                self._flush()
+
+        logging.info(f"Batch finished: {self.summary}")
+        return results
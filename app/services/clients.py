@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Iterable, Optional
+
+from app import config
+from app.utils.metrics import track_stage
+
+
+def _start_openai():
+    from app.services.openai_client import get_openai_client
+    get_openai_client().start()
+
+
+def _start_line():
+    from app.services.line_bot import get_line_bot
+    get_line_bot()
+
+
+def _start_scraper():
+    from app.services.scrapers.html_parser import parse_html
+    from app.services.scrapers.http_client import get_http_client
+    get_http_client()
+    # Loads the lxml parser as well
+    parse_html(b"<p></p>")
+
+
+def _start_mysql():
+    from app.models.connection_pool import get_pool
+    pool = get_pool()
+    pool.release(pool.checkout())
+
+
+# Every long-lived client a worker shares across its threads. Each entry creates
+# its client through the module's get_x() singleton, so whichever comes first,
+# the warm-up or a real request, sets it up and everyone else reuses it.
+CLIENTS: Dict[str, Callable[[], None]] = {
+    "openai": _start_openai,
+    "line": _start_line,
+    "scraper": _start_scraper,
+    "mysql": _start_mysql,
+}
+
+
+def _enabled(name: str) -> bool:
+    return name != "mysql" or config.DB_ENABLED
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """
+    Create the shared clients now so the first real request doesn't pay for it.
+
+    Importing the SDKs, starting the OpenAI event loop and opening the first
+    MySQL connection happen here; calling it again only re-checks them.
+
+    Args:
+        names: Clients to warm up; defaults to all of CLIENTS
+
+    Returns:
+        Dictionary of client name to {"status": "ready" | "skipped" | "failed", "ms": float}
+        plus "error" for failed clients
+
+    Raises:
+        KeyError: If a name is not in CLIENTS
+    """
+    names = list(CLIENTS) if names is None else list(names)
+    unknown = [name for name in names if name not in CLIENTS]
+    if unknown:
+        raise KeyError(f"Unknown clients: {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        if not _enabled(name):
+            results[name] = {"status": "skipped", "ms": 0.0}
+            continue
+
+        started = time.perf_counter()
+        try:
+            with track_stage(f"warmup.{name}"):
+                CLIENTS[name]()
+            results[name] = {"status": "ready", "ms": (time.perf_counter() - started) * 1000}
+        except Exception as e:
+            logging.error(f"Warming up {name} failed: {traceback.format_exc()}")
+            results[name] = {"status": "failed", "ms": (time.perf_counter() - started) * 1000, "error": str(e)}
+    return results
+
+
+def warm_up_async():
+    """Warm up every client in a background thread so worker boot is not blocked"""
+    threading.Thread(target=warm_up, name="clients-warmup", daemon=True).start()
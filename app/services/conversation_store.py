@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app import config
+
+# One question and the answer it got
+Turn = Tuple[str, str]
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count, same rule as the rate limiter: ~3 characters per token plus message overhead"""
+    return len(text or "") // 3 + 10
+
+
+class _Conversation:
+    def __init__(self, max_turns: int, turns=()):
+        self.turns: Deque[Turn] = deque(turns, maxlen=max_turns)
+        self.last_active = time.monotonic()
+
+
+class ConversationStore:
+    """
+    Recent chat history per LINE user.
+
+    Each user gets a ring buffer of their last `max_turns` question/answer
+    pairs. Users are kept in an LRU of at most `max_users` entries and their
+    history is dropped after `ttl` seconds of inactivity. With `persistent`
+    on, turns are also written to the `conversation_messages` table and a
+    user's history is reloaded from there after eviction or a restart.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 1000,
+        max_turns: int = 10,
+        ttl: float = 3600,
+        token_budget: int = 2000,
+        persistent: bool = False,
+    ):
+        """
+        Args:
+            max_users: Maximum number of conversations kept in memory
+            max_turns: Question/answer pairs remembered per user
+            ttl: Seconds of inactivity after which a conversation is forgotten
+            token_budget: Maximum estimated tokens of history sent with a question
+            persistent: Also store turns in MySQL
+        """
+        self.max_users = max_users
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self.token_budget = token_budget
+        self.persistent = persistent
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, user_id: str) -> Optional[_Conversation]:
+        now = time.monotonic()
+        with self._lock:
+            conversation = self._conversations.get(user_id)
+            if conversation is not None:
+                if now - conversation.last_active <= self.ttl:
+                    self._conversations.move_to_end(user_id)
+                    return conversation
+                del self._conversations[user_id]
+
+        if not self.persistent:
+            return None
+        try:
+            from app.models.database import Database
+            turns = Database().fetch_conversation_turns(user_id, self.max_turns, self.ttl)
+        except Exception as e:
+            logging.error(f"Failed to load conversation of {user_id}: {e}")
+            return None
+        if not turns:
+            return None
+        conversation = _Conversation(self.max_turns, turns)
+        self._remember(user_id, conversation)
+        return conversation
+
+    def _remember(self, user_id: str, conversation: _Conversation):
+        with self._lock:
+            self._conversations[user_id] = conversation
+            self._conversations.move_to_end(user_id)
+            while len(self._conversations) > self.max_users:
+                self._conversations.popitem(last=False)
+
+    def history(self, user_id: str) -> List[Turn]:
+        """Return the remembered turns of a user, oldest first"""
+        conversation = self._get(user_id)
+        return list(conversation.turns) if conversation else []
+
+    def build_messages(self, user_id: str, question: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Build the OpenAI messages for a new question, including as much recent history as fits the budget.
+
+        Older turns are dropped first; the new question is always included.
+
+        Args:
+            user_id: LINE user ID
+            question: The user's new message
+            system_prompt: Optional system message placed first
+
+        Returns:
+            Chat messages in OpenAI format
+        """
+        budget = self.token_budget - count_tokens(question) - (count_tokens(system_prompt) if system_prompt else 0)
+
+        kept = []
+        for asked, answered in reversed(self.history(user_id)):
+            cost = count_tokens(asked) + count_tokens(answered)
+            if cost > budget:
+                break
+            budget -= cost
+            kept.append((asked, answered))
+
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        for asked, answered in reversed(kept):
+            messages.append({"role": "user", "content": asked})
+            messages.append({"role": "assistant", "content": answered})
+        messages.append({"role": "user", "content": question})
+        return messages
+
+    def append(self, user_id: str, question: str, answer: str):
+        """
+        Remember a question and its answer.
+
+        Args:
+            user_id: LINE user ID
+            question: The user's message
+            answer: The bot's reply
+        """
+        conversation = self._get(user_id)
+        if conversation is None:
+            conversation = _Conversation(self.max_turns)
+            self._remember(user_id, conversation)
+        conversation.turns.append((question, answer))
+        conversation.last_active = time.monotonic()
+
+        if self.persistent:
+            try:
+                from app.models.database import Database
+                Database().save_conversation_turn(user_id, question, answer)
+            except Exception as e:
+                logging.error(f"Failed to save conversation of {user_id}: {e}")
+
+    def clear(self, user_id: str) -> bool:
+        """
+        Forget a user's history, in memory and in MySQL.
+
+        An empty conversation stays cached, so this worker doesn't reload old
+        turns from MySQL even if deleting them failed.
+
+        Args:
+            user_id: LINE user ID
+
+        Returns:
+            False if the stored turns could not be deleted
+        """
+        self._remember(user_id, _Conversation(self.max_turns))
+
+        if self.persistent:
+            try:
+                from app.models.database import Database
+                Database().delete_conversation_turns(user_id)
+            except Exception as e:
+                logging.error(f"Failed to delete conversation of {user_id}: {e}")
+                return False
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._conversations)
+
+
+conversation_store = ConversationStore(
+    max_users=config.CONVERSATION_MAX_USERS,
+    max_turns=config.CONVERSATION_MAX_TURNS,
+    ttl=config.CONVERSATION_TTL,
+    token_budget=config.CONVERSATION_TOKEN_BUDGET,
+    persistent=config.DB_ENABLED and config.CONVERSATION_PERSIST,
+)
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from app import config
+from app.models.vocabulary import german_key, strip_article
+from app.services.word_frequency import lemma_forms
+
+
+class KnownWordsIndex:
+    """
+    In-memory set of the German words already stored in `vocabularies`.
+
+    The set is warmed from MySQL once and then kept current two ways: this
+    worker adds the words it saves itself, and at most every `sync_interval`
+    seconds it fetches rows with an id above the highest one it has seen, so
+    words saved by other gunicorn workers or instances show up too.
+
+    Saved words are indexed without their article ("die Energiewende" as
+    "Energiewende"). A lookup also tries the capitalised spelling and crude
+    lemma forms, so "Gesetzes" from an article matches the saved "das Gesetz".
+    """
+
+    def __init__(self, sync_interval: float = 60.0):
+        """
+        Args:
+            sync_interval: Minimum seconds between incremental syncs with MySQL
+        """
+        self.sync_interval = sync_interval
+        self._words = set()
+        self._last_id = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    @staticmethod
+    def normalize(word: str) -> str:
+        """Key a saved word is indexed under: the exact form the unique key on `german` compares, minus the article"""
+        return strip_article(german_key(word))
+
+    def _is_known(self, word: str) -> bool:
+        """Caller holds `_lock`"""
+        word = self.normalize(word)
+        if not word:
+            return False
+        # Nouns are saved capitalised but may be written in lower case
+        spellings = [word] if word[0].isupper() else [word, word[0].upper() + word[1:]]
+        return any(form in self._words for spelling in spellings for form in lemma_forms(spelling))
+
+    def sync(self, force: bool = False):
+        """Fetch rows added since the last sync; cheap no-op inside `sync_interval`"""
+        if not config.DB_ENABLED:
+            return
+        if not force and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        # One thread syncs, the others keep using the current set
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            from app.models.database import Database
+
+            rows = Database().fetch_vocabulary_words(after_id=self._last_id)
+            with self._lock:
+                for row in rows:
+                    self._words.add(self.normalize(row["german"]))
+                    self._last_id = max(self._last_id, row["id"])
+            self._last_sync = time.monotonic()
+            if rows:
+                logging.info(f"Known words index synced {len(rows)} rows, {len(self._words)} words total")
+        except Exception as e:
+            logging.error(f"Failed to sync known words index: {e}")
+            # Back off for a full interval instead of hammering a broken DB on every lookup
+            self._last_sync = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def warm_up_async(self):
+        """Load the index in a background thread so worker boot is not blocked on MySQL"""
+        threading.Thread(target=self.sync, kwargs={"force": True}, name="known-words-warmup", daemon=True).start()
+
+    def add(self, words: Iterable[str]):
+        """Record words this worker has just saved"""
+        with self._lock:
+            self._words.update(self.normalize(word) for word in words if word)
+
+    def contains(self, word: str) -> bool:
+        self.sync()
+        with self._lock:
+            return self._is_known(word)
+
+    def filter_unknown(self, vocabularies: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Drop vocabularies whose German word is already stored.
+
+        Args:
+            vocabularies: List of vocabulary dictionaries
+
+        Returns:
+            The vocabularies that are not in the index, in their original order
+        """
+        self.sync()
+        with self._lock:
+            return [vocab for vocab in vocabularies if not self._is_known(vocab.get("german"))]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._words)
+
+
+known_words_index = KnownWordsIndex(sync_interval=config.KNOWN_WORDS_SYNC_INTERVAL)
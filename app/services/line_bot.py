@@ -1,31 +1,82 @@
-from linebot import LineBotApi, WebhookHandler
-from linebot.models import TextSendMessage
+import threading
+from typing import Optional
+
 from app import config
+from app.utils.metrics import track_stage
+
+
+class RawMessage:
+    """Message given as a ready-made API dictionary, e.g. a cached Flex payload"""
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def as_json_dict(self):
+        return self.payload
+
 
 class LineBot:
     def __init__(self):
-        self.line_bot_api = LineBotApi(config.LINE_ACCESS_TOKEN)
+        # linebot pulls in requests and its models; load it with the first bot, not at boot
+        from linebot import LineBotApi, WebhookHandler
+
+        self.line_bot_api = LineBotApi(config.LINE_ACCESS_TOKEN, endpoint=config.LINE_API_ENDPOINT)
         self.handler = WebhookHandler(config.LINE_CHANNEL_SECRET)
 
     def send_message(self, title, msg):
         """Send push message to user"""
+        from linebot.models import TextSendMessage
+
+        try:
+            with track_stage("line.push"):
+                self.line_bot_api.push_message(
+                    config.LINE_USER_ID,
+                    TextSendMessage(text=f"Your daily news: {title}\nLink: {msg}"),
+                )
+            return "OK"
+        except:
+            return "error"
+
+    def multicast(self, user_ids, text, retry_key=None):
+        """
+        Send the same message to up to 500 users in one API call.
+
+        Unlike the other helpers this raises LineBotApiError, so callers can
+        decide whether to retry. Reusing `retry_key` makes a retry idempotent.
+        """
+        from linebot.models import TextSendMessage
+
+        with track_stage("line.multicast"):
+            self.line_bot_api.multicast(user_ids, TextSendMessage(text=text), retry_key=retry_key)
+
+    def reply_messages(self, reply_token, messages):
+        """Reply with up to 5 pre-rendered message dictionaries"""
         try:
-            self.line_bot_api.push_message(
-                config.LINE_USER_ID,
-                TextSendMessage(text=f"Your daily news: {title}\nLink: {msg}"),
-            )
+            with track_stage("line.reply"):
+                self.line_bot_api.reply_message(reply_token, [RawMessage(message) for message in messages])
             return "OK"
         except:
             return "error"
 
-    def reply(self, reply_token, text):
-        """Reply to user message"""
+    def push_messages(self, user_id, messages):
+        """Push up to 5 pre-rendered message dictionaries to a user"""
         try:
-            # can reply multiple messages
-            self.line_bot_api.reply_message(
-                reply_token=reply_token,
-                messages=[TextSendMessage(text=text)]
-            )
+            with track_stage("line.push"):
+                self.line_bot_api.push_message(user_id, [RawMessage(message) for message in messages])
             return "OK"
         except:
             return "error"
+
+
+_line_bot: Optional[LineBot] = None
+_line_bot_lock = threading.Lock()
+
+
+def get_line_bot() -> LineBot:
+    """Return the process-wide LINE bot, creating it on first use"""
+    global _line_bot
+    if _line_bot is None:
+        with _line_bot_lock:
+            if _line_bot is None:
+                _line_bot = LineBot()
+    return _line_bot
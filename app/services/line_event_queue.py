@@ -0,0 +1,96 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List
+
+from app.utils.metrics import Counter, registry
+
+REJECTED_EVENTS = registry.register(Counter(
+    "chatbot_line_events_rejected_total", "LINE events refused with a 503 because the event queue was full"
+))
+
+class LineEventQueue:
+    """
+    Bounded work queue drained by a pool of daemon worker threads.
+
+    The webhook puts LINE events on the queue and acknowledges the request
+    straight away; the workers run the slow part (OpenAI, DB, reply) in the
+    background. Workers are started lazily on the first submit, so importing
+    this module has no side effects.
+
+    The queue lives in process memory and LINE does not redeliver events it
+    got a 200 for, so the host must keep CPU allocated after the response is
+    sent and must not scale the instance away with events queued (Cloud Run:
+    --no-cpu-throttling, see the deploy workflow).
+    """
+
+    def __init__(self, handler: Callable[[Dict, float], None], workers: int = 4, maxsize: int = 100):
+        """
+        Args:
+            handler: Called as handler(event, received_at) for every queued event
+            workers: Number of worker threads
+            maxsize: Maximum number of queued events before new ones are rejected
+        """
+        self.handler = handler
+        self.workers = workers
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"line-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, events: List[Dict]) -> bool:
+        """
+        Queue the events of one webhook request for background processing, all or nothing.
+
+        If the queue cannot take every event, none is queued, so the webhook
+        can answer with an error and LINE redelivers the whole request
+        without any event being handled twice.
+
+        Args:
+            events: The LINE webhook events of one request
+
+        Returns:
+            True if the events were queued, False if the queue is too full
+        """
+        self._ensure_started()
+        received_at = time.monotonic()
+        # Only submitters add to the queue and they take turns, so the free space can only grow after the check
+        with self._submit_lock:
+            free = self._queue.maxsize - self._queue.qsize()
+            if len(events) > free:
+                REJECTED_EVENTS.inc(len(events))
+                logging.error(
+                    f"LINE event queue is full ({self._queue.qsize()}/{self._queue.maxsize}), "
+                    f"rejecting {len(events)} events"
+                )
+                return False
+            for event in events:
+                self._queue.put_nowait((event, received_at))
+        return True
+
+    def _run(self):
+        while True:
+            event, received_at = self._queue.get()
+            try:
+                self.handler(event, received_at)
+            except Exception:
+                logging.error(f"Failed to process LINE event: {traceback.format_exc()}")
+            finally:
+                self._queue.task_done()
+
+    def pending(self) -> int:
+        """Return the number of events waiting for a worker"""
+        return self._queue.qsize()
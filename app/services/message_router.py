@@ -0,0 +1,135 @@
+import logging
+import re
+from typing import Dict, Optional
+
+from app import config
+from app.constants.line_request_constants import GENERATE_VOCA, HELP, NEWS, RESET
+from app.models.vocabulary import ARTICLES
+from app.services.conversation_store import conversation_store
+from app.utils.metrics import Counter, registry
+
+ROUTED_MESSAGES = registry.register(Counter(
+    "chatbot_routed_messages_total", "LINE messages by the route that answered them", ("route",)
+))
+
+HELP_TEXT = (
+    "Hi! Here is what I can do:\n"
+    "- Ask me anything and I'll answer (I remember our recent chat)\n"
+    f"- Send \"{GENERATE_VOCA}\" followed by a German article to get vocabularies\n"
+    "- Send a single German word to look it up in your saved vocabularies\n"
+    f"- {NEWS}: today's news\n"
+    f"- {RESET}: start a new conversation\n"
+    f"- {HELP}: show this message"
+)
+
+# Small talk answered without the model; patterns must match the whole message
+INTENTS = [
+    (re.compile(r"(hi|hey|hello|hallo|servus|moin|guten (morgen|tag|abend))", re.IGNORECASE),
+     "Hallo! Ask me a question, send a German word, or type /help."),
+    (re.compile(r"(danke( schön| sehr)?|vielen dank|thanks?( you)?|thx)", re.IGNORECASE),
+     "Gern geschehen!"),
+    (re.compile(r"(tschüss|tschüs|ciao|bye|auf wiedersehen|bis bald)", re.IGNORECASE),
+     "Tschüss! Bis bald."),
+    (re.compile(r"(help|hilfe|\?)", re.IGNORECASE), HELP_TEXT),
+]
+
+# A single German word, optionally with its article
+SINGLE_WORD_RE = re.compile(r"(?:(der|die|das)\s+)?([A-Za-zÄÖÜäöüß]+(?:-[A-Za-zÄÖÜäöüß]+)*)", re.IGNORECASE)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().rstrip("!.").strip()
+
+
+def _format_vocabulary(vocab: Dict[str, str]) -> str:
+    lines = [vocab["german"], vocab["english"], vocab["chinese"]]
+    if vocab.get("sentence"):
+        lines.append(vocab["sentence"])
+    return "\n".join(lines)
+
+
+def _run_command(command: str, user_id: Optional[str]) -> Optional[str]:
+    if command == HELP:
+        return HELP_TEXT
+
+    if command == RESET:
+        if user_id and not conversation_store.clear(user_id):
+            return "Sorry, I couldn't reset our conversation. Please try again later."
+        return "OK, let's start a new conversation."
+
+    if command == NEWS:
+        from app.services.news_digest import digest_store, format_digest
+        digest = digest_store.get()
+        if digest is None:
+            return "Today's news is not ready yet. Please try again later."
+        return format_digest(digest)
+
+    return f"Unknown command {command}. Type {HELP} to see what I can do."
+
+
+def _lookup_word(text: str) -> Optional[str]:
+    """Answer a single German word from the saved vocabularies, or None if it isn't saved"""
+    match = SINGLE_WORD_RE.fullmatch(text)
+    if not match or not config.DB_ENABLED:
+        return None
+
+    from app.models.database import Database
+    from app.services.known_words import known_words_index
+
+    article, word = match.group(1), match.group(2)
+    # Saved words are case-sensitive; users often type nouns in lower case
+    spellings = [word] if word[0].isupper() else [word, word[0].upper() + word[1:]]
+    # Words may be saved with or without their article
+    if article:
+        candidates = [f"{article.lower()} {spelling}" for spelling in spellings] + spellings
+    else:
+        candidates = spellings + [f"{a} {spelling}" for spelling in spellings for a in ARTICLES]
+
+    for candidate in candidates:
+        # The in-memory index keeps misses from reaching MySQL
+        if not known_words_index.contains(candidate):
+            continue
+        try:
+            vocab = Database().find_vocabulary(candidate)
+        except Exception as e:
+            logging.error(f"Vocabulary lookup for {candidate} failed: {e}")
+            return None
+        if vocab:
+            return _format_vocabulary(vocab)
+    return None
+
+
+def route_message(message_text: str, user_id: Optional[str] = None) -> Optional[str]:
+    """
+    Answer a LINE message locally when no model call is needed.
+
+    Tried in order: slash commands, small-talk intents and the lookup of a
+    single German word among the saved vocabularies.
+
+    Args:
+        message_text: The user's message
+        user_id: LINE user ID, used by commands that act on the conversation
+
+    Returns:
+        The reply text, or None if the message has to go to OpenAI
+    """
+    text = _normalize(message_text)
+    if not text:
+        return None
+
+    if text.startswith("/"):
+        ROUTED_MESSAGES.inc(route="command")
+        return _run_command(text.split()[0].lower(), user_id)
+
+    for pattern, reply in INTENTS:
+        if pattern.fullmatch(text):
+            ROUTED_MESSAGES.inc(route="intent")
+            return reply
+
+    reply = _lookup_word(text)
+    if reply is not None:
+        ROUTED_MESSAGES.inc(route="lookup")
+        return reply
+
+    ROUTED_MESSAGES.inc(route="llm")
+    return None
@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Dict, Optional
+
+from app import config
+from app.models.database import Database
+from app.services.analyzer import gen_and_save_vocabularies
+from app.services.news_fanout import fan_out
+from app.services.news_scraper import scrape_news
+from app.services.seen_articles import seen_articles_index
+from app.utils.metrics import timed
+from app.utils.response_format import format_vocabularies_for_line
+
+
+@timed("news.build_digest")
+def build_digest() -> Optional[Dict]:
+    """
+    Scrape today's article and pre-compute its vocabularies.
+
+    This is the slow part of the daily push (scraping plus an OpenAI call),
+    so the scheduler runs it ahead of the send time.
+
+    Returns:
+        Dictionary with keys: title, link, source, vocabularies, created_at;
+        None if no new article could be scraped
+    """
+    news_data = scrape_news()
+    if news_data is None:
+        logging.error("Digest not built: no new article could be scraped")
+        return None
+
+    vocabularies = []
+    if news_data.get("content"):
+        vocabularies, msg = gen_and_save_vocabularies(news_data["content"])
+        logging.info(f"Digest vocabularies: {msg}")
+
+    return {
+        "title": news_data["title"],
+        "link": news_data["link"],
+        "source": news_data.get("source"),
+        "vocabularies": vocabularies,
+        "created_at": time.time(),
+    }
+
+
+def format_digest(digest: Dict) -> str:
+    """
+    Render a digest as the LINE message text.
+
+    Args:
+        digest: Digest dictionary from `build_digest`
+
+    Returns:
+        Message text
+    """
+    message = f"Your daily news: {digest['title']}\nLink: {digest['link']}"
+    if digest.get("vocabularies"):
+        message += "\n\n" + format_vocabularies_for_line(digest["vocabularies"])
+    return message
+
+
+class DigestStore:
+    """
+    Holds the latest ready-to-send digest.
+
+    The digest is kept in memory for the worker that built it and written to
+    the `news_digests` table, so other workers and a separate scheduler
+    process can pick it up. A digest older than `max_age` is not served.
+    """
+
+    def __init__(self, max_age: float = 6 * 3600):
+        """
+        Args:
+            max_age: Seconds a digest stays valid after it was built
+        """
+        self.max_age = max_age
+        self._digest = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, digest: Optional[Dict]) -> bool:
+        return digest is not None and time.time() - digest["created_at"] < self.max_age
+
+    def put(self, digest: Dict):
+        """Store a freshly built digest in memory and, if enabled, in MySQL"""
+        with self._lock:
+            self._digest = digest
+
+        if config.DB_ENABLED:
+            try:
+                Database().save_digest(
+                    datetime.fromtimestamp(digest["created_at"]).strftime("%Y-%m-%d"),
+                    json.dumps(digest, ensure_ascii=False),
+                )
+            except Exception as e:
+                logging.error(f"Failed to save news digest: {e}")
+
+    def get(self) -> Optional[Dict]:
+        """
+        Return the latest digest if it is still fresh.
+
+        Returns:
+            Digest dictionary, or None if there is no fresh digest
+        """
+        with self._lock:
+            digest = self._digest
+        if self._is_fresh(digest):
+            return digest
+
+        if config.DB_ENABLED:
+            try:
+                row = Database().fetch_latest_digest()
+                if row:
+                    digest = json.loads(row["payload"])
+                    if self._is_fresh(digest):
+                        with self._lock:
+                            self._digest = digest
+                        return digest
+            except Exception as e:
+                logging.error(f"Failed to load news digest: {e}")
+        return None
+
+
+digest_store = DigestStore(max_age=config.NEWS_DIGEST_MAX_AGE)
+
+
+def prepare_digest() -> Optional[Dict]:
+    """
+    Make sure a fresh digest is ready, building one only if needed.
+
+    Returns:
+        The ready digest, or None if building failed
+    """
+    digest = digest_store.get()
+    # A digest whose article has been pushed meanwhile is replaced by the next new article
+    if digest is not None and not seen_articles_index.is_pushed(digest["link"]):
+        return digest
+
+    try:
+        digest = build_digest()
+    except Exception:
+        logging.error(f"Failed to build news digest: {traceback.format_exc()}")
+        return None
+    if digest is not None:
+        digest_store.put(digest)
+        logging.info(f"News digest ready: {digest['title']} ({len(digest['vocabularies'])} vocabularies)")
+    return digest
+
+
+def push_digest() -> Optional[Dict]:
+    """
+    Deliver the ready digest to all subscribers.
+
+    Falls back to building the digest inline when the scheduler has not
+    prepared one.
+
+    Returns:
+        Dictionary with keys: digest, delivery; None if no digest is available
+    """
+    digest = prepare_digest()
+    if digest is None:
+        return None
+    delivery = fan_out(format_digest(digest))
+    if delivery["sent"]:
+        seen_articles_index.mark_pushed(digest["link"])
+    return {"digest": digest, "delivery": delivery}
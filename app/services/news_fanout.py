@@ -0,0 +1,107 @@
+import logging
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app import config
+from app.models.database import Database
+from app.services.line_bot import LineBot, get_line_bot
+from app.utils.metrics import timed
+
+# LINE accepts at most this many recipients per multicast call
+MULTICAST_LIMIT = 500
+
+
+def get_recipients() -> List[str]:
+    """
+    Return the LINE user IDs that should receive a broadcast.
+
+    Active subscribers come from MySQL. Without a database, or before anyone
+    has subscribed, the single configured LINE_USER_ID is used.
+    """
+    if config.DB_ENABLED:
+        try:
+            subscribers = Database().fetch_active_subscribers()
+            if subscribers:
+                return subscribers
+        except Exception as e:
+            logging.error(f"Failed to load subscribers, falling back to LINE_USER_ID: {e}")
+    return [config.LINE_USER_ID] if config.LINE_USER_ID else []
+
+
+def _is_retryable(error: Exception) -> bool:
+    return error.status_code == 429 or error.status_code >= 500
+
+
+def _send_chunk(linebot: LineBot, user_ids: List[str], text: str) -> Tuple[str, Optional[str]]:
+    """Multicast to one chunk of recipients with retries; returns (status, error)"""
+    from linebot.exceptions import LineBotApiError
+
+    # The same retry key on every attempt lets LINE drop duplicates of an accepted request
+    retry_key = str(uuid.uuid4())
+    for attempt in range(config.FANOUT_RETRIES + 1):
+        try:
+            linebot.multicast(user_ids, text, retry_key=retry_key)
+            return "sent", None
+        except LineBotApiError as e:
+            if e.status_code == 409:
+                # An earlier attempt with this retry key was already accepted
+                return "sent", None
+            if attempt >= config.FANOUT_RETRIES or not _is_retryable(e):
+                logging.error(f"Multicast to {len(user_ids)} users failed: {e}")
+                return "failed", str(e)
+            error = e
+        except Exception as e:
+            if attempt >= config.FANOUT_RETRIES:
+                logging.error(f"Multicast to {len(user_ids)} users failed: {e}")
+                return "failed", str(e)
+            error = e
+        delay = random.uniform(0, min(30.0, 2 ** attempt))
+        logging.warning(f"Multicast attempt {attempt + 1} failed ({error}), retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return "failed", "retries exhausted"
+
+
+@timed("news.fan_out")
+def fan_out(text: str, user_ids: Optional[List[str]] = None) -> Dict:
+    """
+    Deliver a text message to many users with as few API calls as possible.
+
+    Recipients are split into multicast chunks of up to 500, sent with
+    FANOUT_CONCURRENCY parallel calls and retried on 429/5xx. The outcome
+    for every recipient is recorded in the `deliveries` table.
+
+    Args:
+        text: Message text
+        user_ids: Recipients; defaults to all active subscribers
+
+    Returns:
+        Dictionary with keys: batch_id, recipients, sent, failed, requests
+    """
+    recipients = list(dict.fromkeys(user_ids if user_ids is not None else get_recipients()))
+    batch_id = str(uuid.uuid4())
+    summary = {"batch_id": batch_id, "recipients": len(recipients), "sent": 0, "failed": 0, "requests": 0}
+    if not recipients:
+        return summary
+
+    chunks = [recipients[i:i + MULTICAST_LIMIT] for i in range(0, len(recipients), MULTICAST_LIMIT)]
+    linebot = get_line_bot()
+    with ThreadPoolExecutor(max_workers=min(len(chunks), config.FANOUT_CONCURRENCY)) as executor:
+        outcomes = list(executor.map(lambda chunk: _send_chunk(linebot, chunk, text), chunks))
+
+    deliveries = []
+    for chunk, (status, error) in zip(chunks, outcomes):
+        summary["requests"] += 1
+        summary[status] += len(chunk)
+        deliveries.extend((user_id, status, error) for user_id in chunk)
+
+    if config.DB_ENABLED:
+        try:
+            Database().save_deliveries(batch_id, deliveries)
+        except Exception as e:
+            logging.error(f"Failed to record deliveries for batch {batch_id}: {e}")
+
+    logging.info(f"Fan-out {batch_id}: {summary}")
+    return summary
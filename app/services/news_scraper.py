@@ -1,8 +1,12 @@
-from typing import Optional, Dict
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, List, Tuple
 
 from app import config
 from app.services.scrapers import BaseScraper
 from app.services.scrapers.ts_learn_german import TSLearnGermanScraper
+from app.utils.metrics import timed
 
 
 # Scraper registry - add your custom scrapers here
@@ -35,13 +39,133 @@ def get_scraper() -> BaseScraper:
     return scraper_class(request_url=request_url)
 
 
+def get_sources() -> List[Tuple[str, str]]:
+    """
+    Parse NEWS_SOURCES into (scraper type, request url) pairs.
+
+    NEWS_SOURCES is a comma-separated list of `type=url` entries. When it is
+    not set, the single NEWS_SCRAPER_TYPE / NEWS_REQUEST_URL source is used.
+
+    Returns:
+        List of (scraper type, request url) tuples
+    """
+    if not config.NEWS_SOURCES:
+        return [(config.NEWS_SCRAPER_TYPE, config.NEWS_REQUEST_URL)]
+
+    sources = []
+    for entry in config.NEWS_SOURCES.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        if "=" not in entry:
+            raise ValueError(f"Invalid NEWS_SOURCES entry '{entry}'. Expected 'type=url'")
+        scraper_type, request_url = (part.strip() for part in entry.split("=", 1))
+        sources.append((scraper_type, request_url))
+    return sources
+
+
+def get_scrapers() -> List[BaseScraper]:
+    """
+    Instantiate a scraper for every configured source.
+
+    Returns:
+        List of BaseScraper instances, in configuration order
+    """
+    scrapers = []
+    for scraper_type, request_url in get_sources():
+        if scraper_type not in SCRAPERS:
+            raise ValueError(f"Unknown scraper type: {scraper_type}. Available: {list(SCRAPERS.keys())}")
+        scrapers.append(SCRAPERS[scraper_type](request_url=request_url))
+    return scrapers
+
+
+def _dedup_key(text: str) -> str:
+    return re.sub(r"\W+", " ", text or "").strip().lower()
+
+
+def merge_articles(results: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """
+    Merge per-source article lists into one ranked, deduplicated list.
+
+    Articles are ranked by their position on their own source (every
+    source's top story first), then by source order. Articles without
+    content and repeats of an already seen link or title are dropped.
+
+    Args:
+        results: One article list per source, each ordered most prominent first
+
+    Returns:
+        Merged list of article dictionaries
+    """
+    ranked = []
+    for source_index, articles in enumerate(results):
+        for position, article in enumerate(articles):
+            if article and article.get("content"):
+                ranked.append((position, source_index, article))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+
+    merged = []
+    seen = set()
+    for _, _, article in ranked:
+        keys = {"link:" + article["link"].rstrip("/"), "title:" + _dedup_key(article["title"])}
+        if keys & seen:
+            continue
+        seen |= keys
+        merged.append(article)
+    return merged
+
+
+@timed("scraper.scrape_all")
+def scrape_all_news(limit_per_source: int = 1) -> List[Dict[str, str]]:
+    """
+    Scrape every configured source concurrently.
+
+    Each source gets NEWS_SCRAPER_TIMEOUT seconds; sources that have not
+    finished by then are skipped so one slow site cannot stall the push.
+
+    Args:
+        limit_per_source: Maximum number of articles to take from each source
+
+    Returns:
+        Ranked, deduplicated list of dictionaries with keys: 'title', 'link', 'content', 'source'
+    """
+    scrapers = get_scrapers()
+
+    def run(scraper: BaseScraper) -> List[Dict[str, str]]:
+        articles = scraper.scrape_many(limit_per_source)
+        for article in articles:
+            article["source"] = scraper.get_name()
+        return articles
+
+    executor = ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="scraper")
+    try:
+        futures = [executor.submit(run, scraper) for scraper in scrapers]
+        wait(futures, timeout=config.NEWS_SCRAPER_TIMEOUT)
+
+        results = []
+        for scraper, future in zip(scrapers, futures):
+            if not future.done():
+                logging.warning(f"Scraper {scraper.get_name()} timed out after {config.NEWS_SCRAPER_TIMEOUT}s")
+                results.append([])
+            elif future.exception() is not None:
+                logging.error(f"Scraper {scraper.get_name()} failed: {future.exception()}")
+                results.append([])
+            else:
+                results.append(future.result())
+    finally:
+        # Don't block on stragglers; their HTTP timeouts will end them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return merge_articles(results)
+
+
 def scrape_news() -> Optional[Dict[str, str]]:
     """
-    Scrape news using the configured scraper.
+    Scrape news using the configured scrapers.
 
     Returns:
-        Dictionary with keys: 'title', 'link', 'content'
+        Dictionary with keys: 'title', 'link', 'content', 'source' for the top ranked article
         None if scraping fails
     """
-    scraper = get_scraper()
-    return scraper.scrape()
\ No newline at end of file
+    articles = scrape_all_news(limit_per_source=1)
+    return articles[0] if articles else None
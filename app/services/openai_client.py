@@ -0,0 +1,310 @@
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+from app import config
+from app.utils.metrics import OPENAI_RETRIES, observe_openai_usage, track_stage
+
+# Longest pause between retries, whatever Retry-After asks for
+MAX_BACKOFF = 30.0
+# Extra time a blocking caller grants the event loop beyond the call deadline
+WAIT_MARGIN = 5.0
+
+
+@functools.lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """Errors worth retrying; anything else (bad request, auth, ...) fails immediately"""
+    import aiohttp
+    from openai import error as openai_error
+
+    return (
+        openai_error.RateLimitError,
+        openai_error.ServiceUnavailableError,
+        openai_error.APIConnectionError,
+        openai_error.Timeout,
+        openai_error.TryAgain,
+        asyncio.TimeoutError,
+        aiohttp.ClientError,
+    )
+
+
+def estimate_tokens(messages: list, max_tokens: Optional[int] = None) -> int:
+    """
+    Rough token estimate used for rate limiting before the real usage is known.
+
+    About 3 characters per token for German text, plus the expected completion.
+    """
+    chars = sum(len(str(message.get("content", ""))) for message in messages)
+    return chars // 3 + 10 * len(messages) + (max_tokens or config.OPENAI_EXPECTED_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most `per_minute` units"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available"""
+        self._refill()
+        # A request larger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+
+class RateLimitScheduler:
+    """
+    Admits OpenAI calls against both a requests-per-minute and a
+    tokens-per-minute budget.
+
+    Callers are admitted in arrival order. Token reservations are based on
+    an estimate and corrected with the real usage once the response arrives.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return
+                await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct a reservation once the real token usage is known"""
+        self.tokens.consume(actual - estimated)
+
+
+class AsyncOpenAIClient:
+    """
+    OpenAI chat client running on a dedicated asyncio event loop.
+
+    The loop lives in one background thread and owns a keep-alive aiohttp
+    session, so every gunicorn thread shares one connection pool instead of
+    holding its own socket for the length of a call. Calls are admitted by a
+    RateLimitScheduler, each attempt times out after `timeout` seconds, and
+    failed attempts are retried with jittered exponential backoff on 429s, 5xx
+    and connection errors, all within a total `call_deadline`.
+
+    openai and aiohttp take a few hundred milliseconds to import, so they are
+    loaded when the client starts rather than when the app boots.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        timeout: float = 60.0,
+        max_retries: int = 4,
+        max_connections: int = 20,
+        call_deadline: float = 90.0,
+    ):
+        """
+        Args:
+            requests_per_minute: Request budget
+            tokens_per_minute: Token budget (prompt + completion)
+            timeout: Seconds allowed for a single attempt
+            max_retries: Retries after the first attempt
+            max_connections: Size of the keep-alive connection pool
+            call_deadline: Seconds a whole call may take, rate-limit waits and retries included
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.call_deadline = call_deadline
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._scheduler: Optional[RateLimitScheduler] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                ready = threading.Event()
+                setup_error = []
+                loop = asyncio.new_event_loop()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    try:
+                        loop.run_until_complete(self._setup())
+                    except Exception as e:
+                        setup_error.append(e)
+                        loop.close()
+                        return
+                    finally:
+                        ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="openai-loop", daemon=True).start()
+                if not ready.wait(self.timeout + WAIT_MARGIN):
+                    raise TimeoutError("OpenAI client did not start in time")
+                if setup_error:
+                    # _loop stays unset, so the next call tries again
+                    raise RuntimeError("OpenAI client failed to start") from setup_error[0]
+                self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _wait(future: concurrent.futures.Future, timeout: float):
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def start(self):
+        """Import the SDKs and start the event loop now instead of on the first call"""
+        retryable_errors()
+        self._ensure_started()
+
+    async def _setup(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(connector=connector)
+        self._scheduler = RateLimitScheduler(self.requests_per_minute, self.tokens_per_minute)
+
+    @staticmethod
+    def _backoff(attempt: int, error: Exception) -> float:
+        retry_after = None
+        headers = getattr(error, "headers", None)
+        if headers:
+            retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_BACKOFF)
+            except ValueError:
+                pass
+        # Full jitter: uniform between 0 and the exponential cap
+        return random.uniform(0, min(MAX_BACKOFF, 0.5 * 2 ** attempt))
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        from openai import error as openai_error
+
+        if isinstance(error, retryable_errors()):
+            return True
+        return isinstance(error, openai_error.APIError) and (error.http_status or 0) >= 500
+
+    async def achat(self, messages: list, model: str = None, **kwargs):
+        """
+        Create a chat completion on the client's event loop.
+
+        Rate-limit waits, attempts and backoff all share one `call_deadline`;
+        when it runs out the call fails with asyncio.TimeoutError, or with the
+        last error if the next retry could not start in time.
+
+        Args:
+            messages: Chat messages in OpenAI format
+            model: Model name; defaults to OPENAI_LANG_MODEL
+            **kwargs: Extra ChatCompletion parameters
+
+        Returns:
+            The OpenAI response object
+        """
+        import openai
+
+        # openai 0.27 picks the aiohttp session up from a context variable
+        openai.aiosession.set(self._session)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.call_deadline
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            with track_stage("openai.rate_limit_wait"):
+                await asyncio.wait_for(self._scheduler.acquire(estimated), timeout=deadline - loop.time())
+            timeout = min(self.timeout, deadline - loop.time())
+            try:
+                with track_stage("openai.chat"):
+                    response = await asyncio.wait_for(
+                        openai.ChatCompletion.acreate(
+                            model=model or config.OPENAI_LANG_MODEL,
+                            messages=messages,
+                            api_key=config.OPENAI_API_KEY,
+                            request_timeout=timeout,
+                            **kwargs,
+                        ),
+                        timeout=timeout,
+                    )
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff(attempt, e)
+                if loop.time() + delay >= deadline:
+                    raise
+                OPENAI_RETRIES.inc()
+                logging.warning(f"OpenAI call failed ({type(e).__name__}: {e}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            usage = response.get("usage") or {}
+            observe_openai_usage(usage)
+            if usage.get("total_tokens"):
+                self._scheduler.settle(estimated, usage["total_tokens"])
+            return response
+
+    def chat(self, messages: list, model: str = None, **kwargs):
+        """Blocking wrapper around `achat` for use from request threads"""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self.achat(messages, model=model, **kwargs), loop)
+        return self._wait(future, self.call_deadline + WAIT_MARGIN)
+
+    def reserve(self, messages: list):
+        """Block until the scheduler admits a call that is made outside the client, e.g. a stream"""
+        loop = self._ensure_started()
+        estimated = estimate_tokens(messages)
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(self._scheduler.acquire(estimated), timeout=self.call_deadline), loop
+        )
+        self._wait(future, self.call_deadline + WAIT_MARGIN)
+
+
+_client: Optional[AsyncOpenAIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> AsyncOpenAIClient:
+    """Return the process-wide OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AsyncOpenAIClient(
+                    requests_per_minute=config.OPENAI_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=config.OPENAI_TOKENS_PER_MINUTE,
+                    timeout=config.OPENAI_TIMEOUT,
+                    max_retries=config.OPENAI_MAX_RETRIES,
+                    call_deadline=config.OPENAI_CALL_DEADLINE,
+                )
+    return _client
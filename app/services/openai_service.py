@@ -1,39 +1,145 @@
-import openai
+import hashlib
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 import logging
 from app import config
+from app.models.vocabulary import german_key
+from app.services.openai_client import get_openai_client
+from app.services.single_flight import SingleFlight
+from app.services.vocabulary_cache import vocabulary_cache, make_cache_key
+from app.services.vocabulary_parser import parse_vocabularies
+from app.services.vocabulary_pipeline import extract_vocabularies_chunked
+from app.utils.metrics import timed
+
+# Identical requests that are in flight at the same time share one upstream call
+inflight_requests = SingleFlight()
+
+@timed("openai_service.ask_question")
+def ask_question(messages) -> str:
+    """
+    Ask OpenAI a question.
 
-openai.api_key = config.OPENAI_API_KEY
+    Args:
+        messages: Chat messages in OpenAI format, or a single question string
 
-def ask_question(messages: list) -> str:
+    Returns:
+        The answer text
+    """
     if not messages:
         return {}
 
-    if not isinstance(messages[0], dict):
-        messages = [{"role": "user", "content": messages[0]}]
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
 
-    response = openai.ChatCompletion.create(
-        model=config.OPENAI_LANG_MODEL,
-        messages=messages
-    )
+    key = hashlib.sha256(
+        json.dumps([config.OPENAI_LANG_MODEL, messages], ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    response = inflight_requests.do("ask:" + key, lambda: get_openai_client().chat(messages))
     return response.choices[0].message.content
 
 
-def extract_vocabularies(text: str, level: str = "B2-C1", count: int = 10) -> List[Dict[str, str]]:
+def stream_question(messages: list) -> Iterator[str]:
+    """
+    Ask a question and yield the answer token by token as OpenAI produces it.
+
+    Args:
+        messages: Chat messages in OpenAI format
+
+    Yields:
+        Content fragments of the answer, in order
+    """
+    # Streams are consumed on the caller's thread, but still count against the rate limits
+    get_openai_client().reserve(messages)
+
+    import openai
+    response = openai.ChatCompletion.create(
+        model=config.OPENAI_LANG_MODEL,
+        messages=messages,
+        api_key=config.OPENAI_API_KEY,
+        stream=True,
+        request_timeout=config.OPENAI_TIMEOUT,
+    )
+    for chunk in response:
+        choices = chunk.get("choices")
+        if not choices:
+            continue
+        content = choices[0].get("delta", {}).get("content")
+        if content:
+            yield content
+
+
+def vocabulary_cache_key(text: str, level: str = "B2-C1", count: int = 10) -> str:
+    """Cache key of an `extract_vocabularies` call; derived entries (e.g. rendered replies) add a suffix"""
+    return make_cache_key(text, level, count, config.OPENAI_LANG_MODEL)
+
+
+@timed("openai_service.extract_vocabularies")
+def extract_vocabularies(
+    text: str,
+    level: str = "B2-C1",
+    count: int = 10,
+    candidates: Optional[List[str]] = None,
+    prompt_text: Optional[str] = None,
+) -> List[Dict[str, str]]:
     """
     Extract German vocabularies from article text using OpenAI.
 
+    Results are cached by a hash of the normalized article text, level, count
+    and model, so an article that was already processed is answered without an
+    OpenAI call, whichever route asked first and whatever was sent to the model.
+    Articles longer than VOCA_CHUNK_CHARS are split into chunks that are
+    extracted concurrently and merged. Concurrent calls for the same article
+    wait for a single upstream request and share its result.
+
     Args:
-        article_text: The German article text
+        text: The German article text
         level: Vocabulary level (default: B2-C1)
         count: Number of vocabularies to extract (default: 10)
+        candidates: Optional locally pre-selected words the model should prefer
+        prompt_text: Optional text to send instead of the whole article, e.g. only
+            the candidates' sentences; the cache key still uses `text`
 
     Returns:
         List of dictionaries with keys: german, english, chinese, sentence
     """
-    try:
-        prompt = f"""You are a German language instructor. Analyze the following German article and extract exactly {count} vocabulary items at the {level} level.
+    cache_key = vocabulary_cache_key(text, level, count)
+    cached = vocabulary_cache.get(cache_key)
+    if cached is not None:
+        return [dict(vocab) for vocab in cached]
+
+    def extract() -> List[Dict[str, str]]:
+        # A call for the same key may have finished between our cache miss and now; already counted
+        cached = vocabulary_cache.peek(cache_key)
+        if cached is not None:
+            return cached
+        source = prompt_text or text
+        if len(source) > config.VOCA_CHUNK_CHARS:
+            vocabularies = extract_vocabularies_chunked(source, level, count, _request_vocabularies)
+        else:
+            vocabularies = _request_vocabularies(source, level, count, candidates=candidates)
+        if vocabularies:
+            vocabulary_cache.set(cache_key, vocabularies)
+        return vocabularies
+
+    vocabularies = inflight_requests.do("voca:" + cache_key, extract)
+    # Every caller gets its own copies; the shared list also lives in the cache
+    return [dict(vocab) for vocab in vocabularies]
+
+
+def _build_vocabulary_prompt(
+    text: str,
+    level: str,
+    count: int,
+    candidates: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+) -> str:
+    candidate_hint = ""
+    if candidates:
+        candidate_hint = f"\nPrefer words from this candidate list when they fit the level: {', '.join(candidates)}\n"
+    if exclude:
+        candidate_hint += f"\nDo not include any of these words, they are already covered: {', '.join(exclude)}\n"
+
+    return f"""You are a German language instructor. Analyze the following German article and extract exactly {count} vocabulary items at the {level} level.
 
 For each vocabulary item, provide the following fields:
 1.The German word (preserve original casing)
@@ -51,48 +157,77 @@ Return the result as a JSON array with the following exact structure and field n
   }}
 ]
 
+{candidate_hint}
 Text:
 {text}
 
 Important: Output only the JSON array without any additional text or explanation, and avoid using emojis and —"""
 
-        response = openai.ChatCompletion.create(
-            model=config.OPENAI_LANG_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful German language teacher. Always respond with valid JSON only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-        )
-        choices = response.get("choices")
-        if not choices or not choices[0].get("message"):
-            raise ValueError("OpenAI returned no choices or message.")
-
-        content = response['choices'][0]['message']['content'].strip()
-
-        # Try to parse JSON response
+
+def _call_vocabularies(prompt: str) -> List[Dict[str, str]]:
+    """Send a vocabulary prompt and return every valid item recovered from the reply"""
+    response = get_openai_client().chat(
+        [
+            {
+                "role": "system",
+                "content": "You are a helpful German language teacher. Always respond with valid JSON only."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+    )
+    choices = response.get("choices")
+    if not choices or not choices[0].get("message"):
+        raise ValueError("OpenAI returned no choices or message.")
+
+    content = response['choices'][0]['message']['content'] or ""
+    vocabularies, rejected = parse_vocabularies(content)
+    if rejected or not vocabularies:
+        logging.warning(f"Recovered {len(vocabularies)} vocabularies, rejected {rejected} items from: {content[:200]}")
+    return vocabularies
+
+
+def _request_vocabularies(
+    text: str,
+    level: str,
+    count: int,
+    candidates: Optional[List[str]] = None,
+) -> List[Dict[str, str]]:
+    """
+    Ask OpenAI for vocabularies without consulting the cache.
+
+    Every complete, schema-valid item in the reply is kept, even if the rest
+    is truncated or malformed. If fewer than `count` items survive, a
+    follow-up request asks only for the missing number, excluding the words
+    already returned, instead of repeating the whole call. If a call fails,
+    the items recovered so far are returned.
+    """
+    vocabularies = []
+    seen = set()
+    for attempt in range(1 + config.VOCA_REPAIR_ATTEMPTS):
+        missing = count - len(vocabularies)
+        if missing <= 0:
+            break
+        if attempt:
+            logging.info(f"Re-asking for {missing} missing vocabularies")
+
+        exclude = [vocab["german"] for vocab in vocabularies]
+        prompt = _build_vocabulary_prompt(text, level, missing, candidates, exclude)
         try:
-            vocabularies = json.loads(content)
-            return vocabularies
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract JSON from markdown code blocks
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-                vocabularies = json.loads(json_str)
-                return vocabularies
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0].strip()
-                vocabularies = json.loads(json_str)
-                return vocabularies
-            else:
-                logging.error(f"Failed to parse OpenAI response as JSON: {content}")
-                return []
-
-    except Exception as e:
-        logging.error(f"Error extracting vocabularies: {str(e)}")
-        return []
+            recovered = _call_vocabularies(prompt)
+        except Exception as e:
+            # The client already retried; keep whatever earlier attempts recovered
+            logging.error(f"Error extracting vocabularies (attempt {attempt + 1}): {str(e)}")
+            break
+
+        for vocab in recovered:
+            key = german_key(vocab["german"])
+            if key not in seen and len(vocabularies) < count:
+                seen.add(key)
+                vocabularies.append(vocab)
+
+    if not vocabularies:
+        logging.error("Failed to parse any vocabulary from the OpenAI response")
+    return vocabularies
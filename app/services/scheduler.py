@@ -0,0 +1,143 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Tuple
+
+from app import config
+
+
+def parse_push_time(value: str) -> Tuple[int, int]:
+    """
+    Parse an "HH:MM" time of day.
+
+    Args:
+        value: Time string, e.g. "07:30"
+
+    Returns:
+        Tuple of (hour, minute)
+    """
+    hour, minute = value.strip().split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid NEWS_PUSH_TIME: {value}")
+    return hour, minute
+
+
+def get_timezone(name: str):
+    """Resolve a timezone name, falling back to UTC if it is unknown"""
+    if not name or name.upper() == "UTC":
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        logging.error(f"Unknown timezone {name} ({e}), using UTC")
+        return timezone.utc
+
+
+class DailyJob:
+    """A callable that runs once a day at a fixed time"""
+
+    def __init__(self, name: str, hour: int, minute: int, fn: Callable[[], object]):
+        self.name = name
+        self.hour = hour
+        self.minute = minute
+        self.fn = fn
+
+    def next_run(self, now: datetime) -> datetime:
+        """Return the first run time strictly after `now`"""
+        run_at = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at
+
+
+class NewsScheduler:
+    """
+    Background thread that prepares and optionally sends the daily news.
+
+    `lead_minutes` before NEWS_PUSH_TIME the article is scraped and its
+    vocabularies are generated and stored as a digest. At NEWS_PUSH_TIME the
+    digest is pushed if `auto_push` is on; otherwise /pushnews, called by an
+    external cron, just sends the prepared digest.
+    """
+
+    def __init__(self, push_time: str, lead_minutes: int = 30, tz_name: str = "UTC", auto_push: bool = False):
+        """
+        Args:
+            push_time: Daily send time as "HH:MM"
+            lead_minutes: How long before the send time the digest is built
+            tz_name: Timezone of `push_time`, e.g. "Europe/Berlin"
+            auto_push: Also send the digest from the scheduler
+        """
+        from app.services.news_digest import prepare_digest, push_digest
+
+        self.tz = get_timezone(tz_name)
+        hour, minute = parse_push_time(push_time)
+        push_at = datetime(2000, 1, 1, hour, minute)
+        prepare_at = push_at - timedelta(minutes=lead_minutes)
+
+        self.jobs = [DailyJob("prepare_digest", prepare_at.hour, prepare_at.minute, prepare_digest)]
+        if auto_push:
+            self.jobs.append(DailyJob("push_digest", hour, minute, push_digest))
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_job(self, now: Optional[datetime] = None) -> Tuple[datetime, DailyJob]:
+        """
+        Find the job that is due next.
+
+        Returns:
+            Tuple of (run time, job)
+        """
+        now = now or datetime.now(self.tz)
+        return min(((job.next_run(now), job) for job in self.jobs), key=lambda item: item[0])
+
+    def run_forever(self):
+        """Run jobs at their scheduled times until `stop` is called"""
+        while not self._stop.is_set():
+            run_at, job = self.next_job()
+            logging.info(f"Scheduler: next job {job.name} at {run_at.isoformat()}")
+            # Sleep in bounded steps so clock changes and stop requests are noticed
+            while not self._stop.is_set():
+                remaining = (run_at - datetime.now(self.tz)).total_seconds()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 300))
+            if self._stop.is_set():
+                break
+            try:
+                logging.info(f"Scheduler: running {job.name}")
+                job.fn()
+            except Exception as e:
+                logging.error(f"Scheduler job {job.name} failed: {e}")
+
+    def start(self):
+        """Start the scheduler in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run_forever, name="news-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> NewsScheduler:
+    """Return the process-wide scheduler configured from NEWS_PUSH_* settings"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = NewsScheduler(
+                    push_time=config.NEWS_PUSH_TIME,
+                    lead_minutes=config.NEWS_PRECOMPUTE_LEAD_MINUTES,
+                    tz_name=config.NEWS_PUSH_TIMEZONE,
+                    auto_push=config.SCHEDULER_AUTO_PUSH,
+                )
+    return _scheduler
@@ -1,10 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+
+from app.services.scrapers.http_client import FetchResult, get_http_client
+from app.utils.metrics import track_stage
 
 
 class BaseScraper(ABC):
     """Abstract base class for news scrapers"""
 
+    def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch a page through the shared pooled HTTP client.
+
+        Args:
+            url: Absolute URL to fetch
+
+        Returns:
+            FetchResult with the raw body and whether it was served from cache after a 304
+        """
+        with track_stage("scraper.fetch"):
+            return get_http_client().fetch(url)
+
     @abstractmethod
     def scrape(self) -> Optional[Dict[str, str]]:
         """
@@ -16,6 +32,23 @@ class BaseScraper(ABC):
         """
         pass
 
+    def scrape_many(self, limit: int = 1) -> List[Dict[str, str]]:
+        """
+        Scrape up to `limit` articles, most prominent first.
+
+        Scrapers that can list several articles should override this and
+        fetch the article pages in parallel; the default only returns the
+        result of `scrape`.
+
+        Args:
+            limit: Maximum number of articles to return
+
+        Returns:
+            List of dictionaries with keys: 'title', 'link', 'content'
+        """
+        article = self.scrape()
+        return [article] if article else []
+
     @abstractmethod
     def get_name(self) -> str:
         """Return the name of this scraper"""
@@ -0,0 +1,45 @@
+from typing import Callable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Prefer lxml's C parser when it is installed; fall back to the pure-Python one
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def has_class(name: str) -> Callable:
+    """
+    Build a class matcher that also works inside a SoupStrainer.
+
+    While parsing, bs4 hands the strainer the raw `class` string (e.g.
+    "textabsatz columns twelve"), so a plain `class_="textabsatz"` only
+    matches elements carrying that single class.
+    """
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return name in classes
+    return match
+
+
+def parse_html(content: bytes, parse_only: Optional[SoupStrainer] = None, parser: str = None) -> BeautifulSoup:
+    """
+    Parse raw HTML bytes with the fastest available backend.
+
+    The body is handed over undecoded so the parser can sniff the encoding
+    itself, and `parse_only` restricts tree building to the matching
+    subtrees, which is where most of the time goes on large pages.
+
+    Args:
+        content: Raw HTML body
+        parse_only: Optional strainer limiting which elements are built
+        parser: Override the backend (e.g. "html.parser"); defaults to PARSER
+
+    Returns:
+        Parsed BeautifulSoup document
+    """
+    return BeautifulSoup(content, parser or PARSER, parse_only=parse_only)
@@ -0,0 +1,133 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app import config
+
+USER_AGENT = "chatbot-buddy/1.0 (+https://github.com/gg41825/chatbot-buddy)"
+
+
+class FetchResult(NamedTuple):
+    """Body of a fetched page and whether it came from the local cache after a 304"""
+    content: bytes
+    not_modified: bool
+
+
+class _CachedPage(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: bytes
+
+
+class HttpClient:
+    """
+    Shared HTTP client for scrapers.
+
+    Wraps a pooled keep-alive `requests.Session` with timeouts and retries
+    with exponential backoff, and revalidates previously fetched pages with
+    ETag / Last-Modified so that unchanged pages are answered by a 304 and
+    served from a local cache.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+        cache_size: int = 64,
+    ):
+        """
+        Args:
+            timeout: Connect/read timeout in seconds
+            retries: Retries on connection errors, 429 and 5xx responses
+            backoff: Backoff factor between retries (0.5 -> 0.5s, 1s, 2s, ...)
+            pool_size: Keep-alive connections kept per host
+            cache_size: Number of pages kept for conditional requests
+        """
+        self.timeout = timeout
+        self.cache_size = cache_size
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._cache: "OrderedDict[str, _CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> FetchResult:
+        """
+        GET a page, revalidating any cached copy.
+
+        Args:
+            url: Absolute URL to fetch
+
+        Returns:
+            FetchResult with the raw (undecoded) body
+
+        Raises:
+            requests.RequestException: On network errors or non-2xx/304 responses
+        """
+        headers = {}
+        with self._lock:
+            cached = self._cache.get(url)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if resp.status_code == 304 and cached is not None:
+            logging.info(f"Not modified, serving cached copy: {url}")
+            with self._lock:
+                self._cache.move_to_end(url)
+            return FetchResult(cached.content, True)
+
+        resp.raise_for_status()
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._cache[url] = _CachedPage(etag, last_modified, resp.content)
+                self._cache.move_to_end(url)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return FetchResult(resp.content, False)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide scraper HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(
+                    timeout=config.SCRAPER_HTTP_TIMEOUT,
+                    retries=config.SCRAPER_HTTP_RETRIES,
+                    pool_size=config.SCRAPER_HTTP_POOL_SIZE,
+                    cache_size=config.SCRAPER_HTTP_CACHE_SIZE,
+                )
+    return _client
@@ -1,10 +1,17 @@
-import requests
 import logging
 import traceback
-from bs4 import BeautifulSoup
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import SoupStrainer
+from typing import Optional, Dict, List, Tuple
 
+from app import config
 from app.services.scrapers import BaseScraper
+from app.services.scrapers.html_parser import has_class, parse_html
+from app.services.seen_articles import hash_text, seen_articles_index
+
+# Only build the parts of each page we actually read
+TEASER_STRAINER = SoupStrainer("a", class_=has_class("teaser__link"))
+PARAGRAPH_STRAINER = SoupStrainer("p", class_=has_class("textabsatz"))
 
 
 class TSLearnGermanScraper(BaseScraper):
@@ -24,28 +31,86 @@ class TSLearnGermanScraper(BaseScraper):
         self.request_url = request_url
 
     def scrape(self) -> Optional[Dict[str, str]]:
-        """Scrape news from Tagesschau"""
+        """Scrape the top news article from Tagesschau"""
+        articles = self.scrape_many(1)
+        return articles[0] if articles else None
+
+    def scrape_many(self, limit: int = 1) -> List[Dict[str, str]]:
+        """
+        Scrape the first `limit` articles of the list page that have not been pushed yet.
+
+        Pushed articles whose teaser is unchanged are skipped without downloading
+        them; the list is walked further down in windows of at least
+        SCRAPER_ARTICLE_WORKERS teasers, fetching each window's article pages in
+        parallel, until enough new articles are found. Even for limit=1 a
+        window is fetched at once, so a run of already pushed articles at the
+        top of the list costs one round of downloads, not one per article.
+        """
         try:
-            # Fetch the news list page
-            resp = requests.get(self.request_url)
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # Find the first article link and title
-            news_link = soup.find("a", class_="teaser__link").get("href")
-            news_title = (
-                soup.find("a", class_="teaser__link")
-                .select_one(".teaser__headline")
-                .text
-            )
+            teasers = self._fetch_teasers()
+        except Exception:
+            logging.error(traceback.format_exc())
+            return []
+
+        pending = [
+            (title, link, hash_text(title, link))
+            for title, link in teasers
+            if seen_articles_index.should_fetch(link, hash_text(title, link))
+        ]
+        if len(pending) < len(teasers):
+            logging.info(f"Skipping {len(teasers) - len(pending)} already pushed articles")
+
+        articles = []
+        batch_size = max(limit, config.SCRAPER_ARTICLE_WORKERS, 1)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            if len(batch) <= 1:
+                fetched = [self._fetch_article(title, link) for title, link, _ in batch]
+            else:
+                workers = min(len(batch), config.SCRAPER_ARTICLE_WORKERS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    fetched = list(executor.map(lambda teaser: self._fetch_article(*teaser[:2]), batch))
+
+            for (_, link, teaser_hash), article in zip(batch, fetched):
+                if not article:
+                    continue
+                content_hash = hash_text(article["content"])
+                # A new headline on an already pushed, otherwise identical article is not news
+                is_new = seen_articles_index.is_new_content(link, content_hash)
+                seen_articles_index.record(link, teaser_hash, content_hash)
+                if is_new:
+                    articles.append(article)
+
+            if len(articles) >= limit:
+                break
+
+        return articles[:limit]
+
+    def _fetch_teasers(self) -> List[Tuple[str, str]]:
+        """Return (title, absolute link) for every teaser on the news list page"""
+        resp = self.fetch(self.request_url)
+        soup = parse_html(resp.content, parse_only=TEASER_STRAINER)
+
+        teasers = []
+        for teaser in soup.find_all("a", class_="teaser__link"):
+            headline = teaser.select_one(".teaser__headline")
+            href = teaser.get("href")
+            if not headline or not href:
+                continue
 
             # Construct full article URL - assuming links are relative paths
-            news_link = self.request_url.rsplit('/', 1)[0] + news_link
+            news_link = href if href.startswith("http") else self.request_url.rsplit('/', 1)[0] + href
+            teasers.append((headline.text.strip(), news_link))
+        return teasers
 
-            resp = requests.get(news_link)
+    def _fetch_article(self, news_title: str, news_link: str) -> Optional[Dict[str, str]]:
+        """Fetch an article page and extract its content paragraphs"""
+        try:
+            resp = self.fetch(news_link)
 
             # Extract article content paragraphs
             paragraphs = []
-            soup = BeautifulSoup(resp.text, "html.parser")
+            soup = parse_html(resp.content, parse_only=PARAGRAPH_STRAINER)
             for paragraph in soup.find_all("p", class_="textabsatz"):
                 paragraphs.append(paragraph.get_text())
 
@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from app import config
+from app.models.database import Database
+
+
+def hash_text(*parts: str) -> str:
+    """Return a stable sha256 hex digest of the given text parts"""
+    return hashlib.sha256("\x1f".join(part or "" for part in parts).encode("utf-8")).hexdigest()
+
+
+class SeenArticle(NamedTuple):
+    teaser_hash: str
+    content_hash: Optional[str]
+    pushed: bool
+
+
+class SeenArticlesIndex:
+    """
+    Memory of the articles that were already scraped or pushed.
+
+    For every article URL it keeps a hash of its teaser (headline and link)
+    and of its body text, plus whether it has been pushed. Scrapers use it to
+    skip pushed articles without downloading them again and walk further down
+    the list instead. The index is loaded from the `seen_articles` table
+    once, written through on every change and re-synced at most every
+    `sync_interval` seconds so other workers' pushes show up too.
+    """
+
+    def __init__(self, sync_interval: float = 60.0):
+        """
+        Args:
+            sync_interval: Minimum seconds between syncs with MySQL
+        """
+        self.sync_interval = sync_interval
+        self._articles: Dict[str, SeenArticle] = {}
+        self._last_sync = 0.0
+        self._synced_until = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def sync(self, force: bool = False):
+        """Fetch rows changed since the last sync; cheap no-op inside `sync_interval`"""
+        if not config.DB_ENABLED:
+            return
+        if not force and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            rows = Database().fetch_seen_articles(updated_since=self._synced_until)
+            with self._lock:
+                for row in rows:
+                    self._articles[row["url"]] = SeenArticle(row["teaser_hash"], row["content_hash"], bool(row["pushed"]))
+                    if self._synced_until is None or row["updated_at"] > self._synced_until:
+                        self._synced_until = row["updated_at"]
+            self._last_sync = time.monotonic()
+        except Exception as e:
+            logging.error(f"Failed to sync seen articles index: {e}")
+            self._last_sync = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def get(self, url: str) -> Optional[SeenArticle]:
+        self.sync()
+        with self._lock:
+            return self._articles.get(url)
+
+    def is_pushed(self, url: str) -> bool:
+        article = self.get(url)
+        return article is not None and article.pushed
+
+    def should_fetch(self, url: str, teaser_hash: str) -> bool:
+        """Whether an article needs downloading: new, not pushed yet, or its teaser changed"""
+        article = self.get(url)
+        return article is None or not article.pushed or article.teaser_hash != teaser_hash
+
+    def is_new_content(self, url: str, content_hash: str) -> bool:
+        """Whether a downloaded body differs from the one that was pushed under this URL"""
+        article = self.get(url)
+        return article is None or not article.pushed or article.content_hash != content_hash
+
+    def record(self, url: str, teaser_hash: str, content_hash: str):
+        """Remember an article that has been downloaded, keeping its pushed state"""
+        with self._lock:
+            previous = self._articles.get(url)
+            pushed = previous.pushed if previous and previous.content_hash == content_hash else False
+            article = SeenArticle(teaser_hash, content_hash, pushed)
+            if previous == article:
+                return
+            self._articles[url] = article
+        self._save(url, article)
+
+    def mark_pushed(self, url: str):
+        """Remember that an article has been sent to subscribers"""
+        with self._lock:
+            previous = self._articles.get(url)
+            article = SeenArticle(
+                previous.teaser_hash if previous else "",
+                previous.content_hash if previous else None,
+                True,
+            )
+            self._articles[url] = article
+        self._save(url, article)
+
+    def _save(self, url: str, article: SeenArticle):
+        if not config.DB_ENABLED:
+            return
+        try:
+            Database().save_seen_article(url, article.teaser_hash, article.content_hash, article.pushed)
+        except Exception as e:
+            logging.error(f"Failed to save seen article {url}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._articles)
+
+
+seen_articles_index = SeenArticlesIndex(sync_interval=config.SEEN_ARTICLES_SYNC_INTERVAL)
@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while
+    it is still running wait for it and get the same result (or exception).
+    Nothing is remembered once the call finishes, so this complements a
+    cache rather than replacing it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` unless a call with the same key is already in flight.
+
+        Args:
+            key: Identity of the call, e.g. a hash of the normalized prompt
+            fn: Zero-argument function doing the actual work
+
+        Returns:
+            The result of `fn`, possibly computed by another thread
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return counters.
+
+        Returns:
+            Dictionary with keys: in_flight, executed, shared
+        """
+        with self._lock:
+            return {"in_flight": len(self._calls), "executed": self.executed, "shared": self.shared}
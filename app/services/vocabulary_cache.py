@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app import config
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that trivially different copies of an article hash the same"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(text: str, level: str, count: int, model: str) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        text: The article text
+        level: Vocabulary level
+        count: Number of vocabularies requested
+        model: OpenAI model name
+
+    Returns:
+        Hex SHA-256 digest of the normalized text and request parameters
+    """
+    payload = "\x1f".join([normalize_text(text), level, str(count), model or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Persistent cache tier stored in a local SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        con = self._connection()
+        con.execute(
+            """CREATE TABLE IF NOT EXISTS vocabulary_cache (
+                   cache_key TEXT PRIMARY KEY,
+                   value TEXT NOT NULL,
+                   expires_at REAL NOT NULL
+               )"""
+        )
+        con.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=5)
+            self._local.con = con
+        return con
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM vocabulary_cache WHERE cache_key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def clear(self):
+        con = self._connection()
+        con.execute("DELETE FROM vocabulary_cache")
+        con.commit()
+
+    def set(self, key: str, value: Any, ttl: float):
+        con = self._connection()
+        con.execute(
+            "INSERT OR REPLACE INTO vocabulary_cache (cache_key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+        )
+        con.commit()
+
+
+class VocabularyCache:
+    """
+    Two-tier cache for extracted vocabularies.
+
+    The first tier is an in-process LRU with a TTL; the optional second tier
+    is a SQLite file that survives restarts. Values must be JSON-serializable.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 86400, sqlite_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            ttl: Seconds an entry stays valid
+            sqlite_path: Path of the persistent SQLite tier; disabled when empty
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+        self._persistent = None
+        if sqlite_path:
+            try:
+                self._persistent = _SQLiteTier(sqlite_path)
+            except Exception as e:
+                logging.error(f"Failed to open vocabulary cache at {sqlite_path}: {e}")
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """Return (value, tier) where tier is "memory", "persistent" or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    return value, "memory"
+                del self._entries[key]
+
+        if self._persistent is not None:
+            try:
+                value = self._persistent.get(key)
+            except Exception as e:
+                logging.error(f"Vocabulary cache read failed: {e}")
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                return value, "persistent"
+        return None, None
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None on a miss.
+
+        Args:
+            key: Cache key
+            count_miss: False when a miss is followed by a lookup that counts it
+                itself, e.g. a rendered reply falling back to its vocabularies
+
+        Returns:
+            The cached value, or None
+        """
+        value, tier = self._lookup(key)
+        with self._lock:
+            if tier == "memory":
+                self.hits += 1
+            elif tier == "persistent":
+                self.persistent_hits += 1
+            elif count_miss:
+                self.misses += 1
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Like `get`, but not counted in the stats.
+
+        For re-checks of a key whose lookup was already counted, so hits and
+        misses count one lookup per vocabulary request.
+        """
+        return self._lookup(key)[0]
+
+    def set(self, key: str, value: Any):
+        """Store `value` under `key` in every tier"""
+        self._remember(key, value)
+        if self._persistent is not None:
+            try:
+                self._persistent.set(key, value, self.ttl)
+            except Exception as e:
+                logging.error(f"Vocabulary cache write failed: {e}")
+
+    def clear(self):
+        """Drop every entry from both tiers and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.persistent_hits = self.misses = 0
+        if self._persistent is not None:
+            try:
+                self._persistent.clear()
+            except Exception as e:
+                logging.error(f"Vocabulary cache clear failed: {e}")
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dictionary with keys: entries, hits, persistent_hits, misses, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.persistent_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.persistent_hits) / total if total else 0.0,
+            }
+
+
+vocabulary_cache = VocabularyCache(
+    max_entries=config.VOCA_CACHE_SIZE,
+    ttl=config.VOCA_CACHE_TTL,
+    sqlite_path=config.VOCA_CACHE_SQLITE_PATH,
+)
@@ -0,0 +1,165 @@
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Field name -> maximum length; german is bounded by the VARCHAR(200) column
+VOCABULARY_SCHEMA = {
+    "german": 200,
+    "english": 1000,
+    "chinese": 1000,
+    "sentence": 2000,
+}
+
+# Start of a wrapper object whose first value is the item array, e.g. {"vocabularies": [
+WRAPPER_START_RE = re.compile(r'\{\s*"([^"\\]*)"\s*:\s*\[')
+
+
+def validate_vocabulary(item) -> Optional[Dict[str, str]]:
+    """
+    Check a parsed object against the vocabulary schema.
+
+    Args:
+        item: Any value decoded from the model output
+
+    Returns:
+        A cleaned dictionary with exactly the schema fields, or None if invalid
+    """
+    if not isinstance(item, dict):
+        return None
+
+    vocab = {}
+    for field, max_length in VOCABULARY_SCHEMA.items():
+        value = item.get(field)
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if not value or len(value) > max_length:
+            return None
+        vocab[field] = value
+    return vocab
+
+
+class VocabularyStreamParser:
+    """
+    Incremental parser that recovers vocabulary objects from model output.
+
+    Text can be fed in arbitrary pieces, e.g. as stream deltas arrive. Every
+    top-level JSON object is decoded as soon as its closing brace is seen, so
+    all complete items survive a truncated array, a markdown code fence or
+    chatter around the JSON. A wrapper object such as {"vocabularies": [...]}
+    is treated as a container, so its items are recovered one by one even
+    if the wrapper never closes. Objects that don't match the schema are
+    counted and skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.rejected = 0
+
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        """
+        Consume more model output.
+
+        Args:
+            text: The next piece of output
+
+        Returns:
+            Valid vocabularies completed by this piece
+        """
+        self._buffer += text
+        found = []
+
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            ch = buffer[i]
+
+            if self._start is None:
+                # Between objects: skip brackets, commas, fences and prose
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "[" and self._depth == 1 and self._is_wrapper(buffer, i):
+                # Step inside the wrapper's array and read its items as top-level objects
+                self._start = None
+                self._depth = 0
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._start:i + 1], found)
+                    self._start = None
+
+        self._pos = len(buffer)
+        # Drop consumed text so long streams don't grow the buffer
+        cut = self._start if self._start is not None else self._pos
+        self._buffer = buffer[cut:]
+        self._pos -= cut
+        if self._start is not None:
+            self._start = 0
+        return found
+
+    def _is_wrapper(self, buffer: str, i: int) -> bool:
+        match = WRAPPER_START_RE.fullmatch(buffer, self._start, i + 1)
+        return match is not None and match.group(1) not in VOCABULARY_SCHEMA
+
+    def _emit(self, raw: str, found: List[Dict[str, str]]):
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            self.rejected += 1
+            logging.warning(f"Skipping malformed vocabulary object: {raw[:120]}")
+            return
+
+        # Some replies wrap the array in an object, e.g. {"vocabularies": [...]}
+        if isinstance(item, dict) and not set(VOCABULARY_SCHEMA) & set(item):
+            nested = [value for value in item.values() if isinstance(value, list)]
+            if nested:
+                for element in nested[0]:
+                    vocab = validate_vocabulary(element)
+                    if vocab is None:
+                        self.rejected += 1
+                    else:
+                        found.append(vocab)
+                return
+
+        vocab = validate_vocabulary(item)
+        if vocab is None:
+            self.rejected += 1
+            logging.warning(f"Skipping vocabulary object that does not match the schema: {raw[:120]}")
+            return
+        found.append(vocab)
+
+
+def parse_vocabularies(content: str) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Recover every valid vocabulary object from a complete model reply.
+
+    Args:
+        content: Raw model output
+
+    Returns:
+        Tuple of (valid vocabularies, number of rejected objects)
+    """
+    parser = VocabularyStreamParser()
+    vocabularies = parser.feed(content)
+    return vocabularies, parser.rejected
@@ -0,0 +1,160 @@
+import logging
+import math
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from app import config
+from app.models.vocabulary import german_key, strip_article
+from app.services.word_frequency import WORD_RE, get_frequency_index, lemma_forms
+
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+ExtractFn = Callable[..., List[Dict[str, str]]]
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most `max_chars`, keeping paragraphs whole where possible.
+
+    Paragraphs are packed greedily; a paragraph that is longer than
+    `max_chars` on its own is split on sentence boundaries.
+
+    Args:
+        text: The article text
+        max_chars: Maximum chunk length in characters
+
+    Returns:
+        List of non-empty chunks in article order
+    """
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(s for s in SENTENCE_END_RE.split(paragraph) if s)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def prefilter_candidates(text: str, limit: int, level: str = "B2-C1") -> List[str]:
+    """
+    Pick likely vocabulary candidates locally, without calling OpenAI.
+
+    Args:
+        text: Text to scan
+        limit: Maximum number of candidates
+        level: CEFR level used to drop words that are too common
+
+    Returns:
+        Candidate words, best first
+    """
+    return [word for word, _ in get_frequency_index().select_candidates(text, level, limit)]
+
+
+def merge_vocabularies(
+    results: List[List[Dict[str, str]]],
+    text: str,
+    count: int,
+) -> List[Dict[str, str]]:
+    """
+    Reduce per-chunk vocabulary lists into a single ranked list.
+
+    Duplicates are merged, keeping the first occurrence. Words are compared
+    exactly (see german_key) but without their article, so "Haus" and
+    "das Haus" are one word. Words found in more chunks rank higher, then
+    words that occur more often in the full text (inflected forms included),
+    then earlier chunks.
+
+    Args:
+        results: Vocabulary lists, one per chunk, in article order
+        text: The full article text
+        count: Number of vocabularies to keep
+
+    Returns:
+        At most `count` vocabulary dictionaries
+    """
+    # Every text word also counts for its crude lemma forms, so "Gesetzes" counts for "Gesetz"
+    text_counts = Counter()
+    for match in WORD_RE.finditer(text):
+        text_counts.update(set(lemma_forms(match.group().lower())))
+
+    merged: Dict[str, Dict[str, str]] = {}
+    chunk_hits = Counter()
+    order = {}
+    for chunk_index, vocabularies in enumerate(results):
+        chunk_keys = set()
+        for item_index, vocab in enumerate(vocabularies or []):
+            key = strip_article(german_key(vocab.get("german")))
+            if not key:
+                continue
+            if key not in merged:
+                merged[key] = vocab
+                order[key] = (chunk_index, item_index)
+            chunk_keys.add(key)
+        # "Haus" and "das Haus" from one chunk are still one hit
+        chunk_hits.update(chunk_keys)
+
+    ranked = sorted(merged, key=lambda key: (-chunk_hits[key], -text_counts.get(key.lower(), 0), order[key]))
+    return [merged[key] for key in ranked[:count]]
+
+
+def extract_vocabularies_chunked(
+    text: str,
+    level: str,
+    count: int,
+    extract_fn: ExtractFn,
+    max_chars: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Map-reduce vocabulary extraction for long articles.
+
+    The article is split into paragraph-aware chunks, each chunk is sent to
+    `extract_fn` concurrently together with locally pre-filtered candidate
+    words, and the per-chunk results are merged down to `count` items.
+
+    Args:
+        text: The German article text
+        level: Vocabulary level
+        count: Number of vocabularies to return
+        extract_fn: Called as extract_fn(chunk, level, per_chunk_count, candidates=[...])
+        max_chars: Chunk size; defaults to VOCA_CHUNK_CHARS
+        workers: Concurrent requests; defaults to VOCA_CHUNK_WORKERS
+
+    Returns:
+        List of dictionaries with keys: german, english, chinese, sentence
+    """
+    chunks = split_into_chunks(text, max_chars or config.VOCA_CHUNK_CHARS)
+    if len(chunks) <= 1:
+        return extract_fn(text, level, count)
+
+    # Ask each chunk for a bit more than its share so the reduce step has something to rank
+    per_chunk = max(3, math.ceil(count * 1.5 / len(chunks)))
+    logging.info(f"Extracting vocabularies from {len(chunks)} chunks, {per_chunk} per chunk")
+
+    def run(chunk: str) -> List[Dict[str, str]]:
+        candidates = prefilter_candidates(chunk, per_chunk * 3, level)
+        try:
+            return extract_fn(chunk, level, per_chunk, candidates=candidates)
+        except Exception as e:
+            logging.error(f"Chunk extraction failed: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), workers or config.VOCA_CHUNK_WORKERS)) as executor:
+        results = list(executor.map(run, chunks))
+
+    return merge_vocabularies(results, text, count)
@@ -0,0 +1,56 @@
+from typing import Dict, Tuple
+
+from app.models.database import Database
+
+MIN_EASE_FACTOR = 1.3
+
+
+def sm2(repetitions: int, interval_days: int, ease_factor: float, quality: int) -> Tuple[int, int, float]:
+    """
+    Compute the next review state with the SM-2 algorithm.
+
+    Args:
+        repetitions: Consecutive successful reviews so far
+        interval_days: Current interval in days
+        ease_factor: Current ease factor
+        quality: Answer quality from 0 (blackout) to 5 (perfect)
+
+    Returns:
+        Tuple of (repetitions, interval_days, ease_factor)
+    """
+    if quality < 3:
+        # Forgotten: start over tomorrow, ease is unchanged
+        return 0, 1, ease_factor
+
+    if repetitions == 0:
+        interval_days = 1
+    elif repetitions == 1:
+        interval_days = 6
+    else:
+        interval_days = round(interval_days * ease_factor)
+
+    ease_factor += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return repetitions + 1, interval_days, max(MIN_EASE_FACTOR, round(ease_factor, 2))
+
+
+def review_vocabulary(user_id: str, vocabulary_id: int, quality: int) -> Dict:
+    """
+    Record a review of a word and schedule the next one.
+
+    Args:
+        user_id: LINE user ID
+        vocabulary_id: Reviewed vocabulary
+        quality: Answer quality from 0 to 5
+
+    Returns:
+        Dictionary with keys: repetitions, interval_days, ease_factor
+    """
+    state = Database().fetch_review(user_id, vocabulary_id)
+    if state:
+        current = (state["repetitions"], state["interval_days"], float(state["ease_factor"]))
+    else:
+        current = (0, 0, 2.5)
+
+    repetitions, interval_days, ease_factor = sm2(*current, quality)
+    Database().save_review(user_id, vocabulary_id, repetitions, interval_days, ease_factor)
+    return {"repetitions": repetitions, "interval_days": interval_days, "ease_factor": ease_factor}
@@ -0,0 +1,232 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "german_frequency.txt"
+
+WORD_RE = re.compile(r"[A-Za-zÄÖÜäöüß]+(?:-[A-Za-zÄÖÜäöüß]+)*")
+SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]?")
+
+# Inflection endings tried (longest first) when a word form is not in the index itself
+SUFFIXES = ("ern", "en", "er", "es", "em", "e", "n", "s")
+
+# Endings of German nouns; an unknown capitalised word with one of them is kept as a candidate
+NOUN_SUFFIXES = ("ung", "heit", "keit", "schaft", "tät", "ion", "nis", "tum", "ismus", "ling", "ment", "enz", "anz")
+
+# Share of the index, most frequent words first, considered known at the given CEFR level.
+# Scaled to the index size so a short bundled list still leaves rarer indexed words as candidates.
+LEVEL_KNOWN_SHARE = {"A1": 0.0, "A2": 0.08, "B1": 0.17, "B2": 0.27, "C1": 0.5, "C2": 1.0}
+
+# Function words that are never worth a vocabulary slot, whatever their rank
+STOPWORDS = frozenset("""
+aber alle allem allen aller alles also andere anderen auch auf aus bei beim bereits bis dabei damit dann darauf
+darum das dass dem den denen denn der deren des deshalb dessen die dies diese diesem diesen dieser dieses doch
+dort durch eine einem einen einer eines etwa etwas für gegen gewesen haben hatte hatten hier hinter ihre ihrem
+ihren ihrer immer jedoch jetzt kann keine können könnte machen mehr mein mit muss müssen nach nicht noch nun nur
+oder ohne schon sehr sein seine seinem seinen seiner selbst sich sind sollen sollte sondern sowie über um unter
+viel viele vom von vor war waren warum was weil weiter welche wenn werden wie wieder will wird wurde wurden zum
+zur zwischen
+""".split())
+
+
+def lemma_forms(word: str) -> List[str]:
+    """
+    Return a word form followed by its crude lemma forms, one per matching inflection ending.
+
+    Args:
+        word: Any inflected word form, e.g. "Gesetzes"
+
+    Returns:
+        The word itself first, then e.g. "Gesetz", "Gesetze"
+    """
+    forms = [word]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            forms.append(word[:-len(suffix)])
+    return forms
+
+
+class FrequencyIndex:
+    """
+    Compact word-frequency rank index for German.
+
+    Word forms are kept in one sorted list with a parallel `array` of ranks,
+    so a lookup is a binary search and the whole index costs a few bytes per
+    entry beyond the strings themselves.
+    """
+
+    def __init__(self, words: List[str]):
+        """
+        Args:
+            words: Word forms in frequency order; rank is the position in the list
+        """
+        ranks: Dict[str, int] = {}
+        for rank, word in enumerate(words):
+            ranks.setdefault(word.lower(), rank)
+
+        self._words = sorted(ranks)
+        self._ranks = array("I", (ranks[word] for word in self._words))
+
+    @classmethod
+    def load(cls, path: Path = DATA_PATH) -> "FrequencyIndex":
+        """Load an index from a word list with one word per line; '#' starts a comment"""
+        words = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    words.append(line)
+        return cls(words)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def _lookup(self, word: str) -> Optional[int]:
+        i = bisect_left(self._words, word)
+        if i < len(self._words) and self._words[i] == word:
+            return self._ranks[i]
+        return None
+
+    def rank(self, word: str) -> Optional[int]:
+        """
+        Return the frequency rank of a word, trying crude lemma forms.
+
+        Args:
+            word: Any inflected word form
+
+        Returns:
+            0-based rank (lower is more frequent), or None if the word is unknown
+        """
+        for form in lemma_forms(word.lower()):
+            rank = self._lookup(form)
+            if rank is not None:
+                return rank
+        return None
+
+    def _has_indexed_tail(self, word: str) -> bool:
+        """Whether a compound ends in an indexed word, e.g. "Klimagesetz" in "gesetz"""
+        for start in range(3, len(word) - 3):
+            if self.rank(word[start:]) is not None:
+                return True
+        return False
+
+    def _is_probable_name(self, word: str, sentence_start: bool) -> bool:
+        """
+        Guess whether an unknown word is a name (person, place, brand) or acronym.
+
+        Every German noun is capitalised, so capitals alone say little. A
+        capitalised word the index does not know, in the middle of a sentence,
+        is only kept when it looks like a noun: a typical noun ending or a
+        compound of an indexed word. Acronyms and words with inner capitals
+        are always dropped.
+        """
+        letters = word.replace("-", "")
+        if sum(1 for char in letters if char.isupper()) > 1:
+            return True
+        if sentence_start or not word[0].isupper():
+            return False
+        key = word.lower()
+        return not (key.endswith(NOUN_SUFFIXES) or self._has_indexed_tail(key))
+
+    def level_threshold(self, level: str) -> int:
+        """
+        Return the rank below which words count as known at a level.
+
+        Args:
+            level: CEFR level or range such as "B2-C1"; the lower bound is used
+
+        Returns:
+            Rank threshold, proportional to the size of the index
+        """
+        share = LEVEL_KNOWN_SHARE.get(level.split("-")[0].strip().upper(), 0.0)
+        return int(share * len(self._words))
+
+    def select_candidates(self, text: str, level: str = "B2-C1", limit: int = 30) -> List[Tuple[str, str]]:
+        """
+        Pick vocabulary candidates and the sentence each first appears in.
+
+        Words that are short, function words, more frequent than the level
+        threshold, or probably names (see `_is_probable_name`) are dropped.
+        The rest are ranked by rarity (unknown words first), then length, then
+        how often they occur, then first appearance, so the selection is
+        deterministic for a given text.
+
+        Args:
+            text: The German article text
+            level: CEFR level or range such as "B2-C1"; the lower bound is used
+            limit: Maximum number of candidates
+
+        Returns:
+            List of (word, sentence) tuples, best candidate first
+        """
+        threshold = self.level_threshold(level)
+
+        counts = Counter()
+        found: Dict[str, Tuple[int, str, str, int]] = {}
+        position = 0
+        for sentence_match in SENTENCE_RE.finditer(text):
+            sentence = sentence_match.group().strip()
+            for number, match in enumerate(WORD_RE.finditer(sentence)):
+                word = match.group()
+                key = word.lower()
+                position += 1
+                if len(key) < 5 or key in STOPWORDS:
+                    continue
+                counts[key] += 1
+                if key in found:
+                    value = found[key]
+                    # Capitals only say something past the first word; re-check words first seen there
+                    if value is not None and value[0] > len(self._words) and number > 0 \
+                            and self._is_probable_name(word, sentence_start=False):
+                        found[key] = None
+                    continue
+                rank = self.rank(key)
+                if rank is not None and rank < threshold:
+                    found[key] = None
+                    continue
+                if rank is None and self._is_probable_name(word, sentence_start=number == 0):
+                    found[key] = None
+                    continue
+                rarity = rank if rank is not None else len(self._words) + 1
+                found[key] = (rarity, word, sentence, position)
+
+        candidates = [(key, value) for key, value in found.items() if value is not None]
+        candidates.sort(key=lambda item: (-item[1][0], -len(item[0]), -counts[item[0]], item[1][3]))
+        return [(value[1], value[2]) for _, value in candidates[:limit]]
+
+
+_index: Optional[FrequencyIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_frequency_index() -> FrequencyIndex:
+    """Return the process-wide frequency index, loading it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FrequencyIndex.load()
+    return _index
+
+
+def build_candidate_text(candidates: List[Tuple[str, str]]) -> str:
+    """
+    Join the distinct sentences of the candidates, in the order given.
+
+    Args:
+        candidates: (word, sentence) tuples from `select_candidates`
+
+    Returns:
+        The sentences separated by newlines
+    """
+    sentences = []
+    seen = set()
+    for _, sentence in candidates:
+        if sentence not in seen:
+            seen.add(sentence)
+            sentences.append(sentence)
+    return "\n".join(sentences)
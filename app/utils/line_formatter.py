@@ -0,0 +1,133 @@
+import logging
+from typing import Dict, List
+
+from app.utils.response_format import format_vocabularies_for_line
+
+# LINE Messaging API limits
+MAX_MESSAGES = 5
+MAX_TEXT_LENGTH = 5000
+MAX_CAROUSEL_BUBBLES = 12
+MAX_ALT_TEXT_LENGTH = 400
+
+# Keeps a bubble readable and the carousel well under LINE's 50 KB per message
+MAX_BUBBLE_TEXT_LENGTH = 300
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def split_text(text: str, limit: int = MAX_TEXT_LENGTH) -> List[str]:
+    """
+    Split text into chunks of at most `limit` characters, preferring line breaks.
+
+    Args:
+        text: Text to split
+        limit: Maximum chunk length
+
+    Returns:
+        Non-empty chunks in order
+    """
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def text_messages(text: str) -> List[Dict]:
+    """
+    Render text as LINE text messages within the per-reply limits.
+
+    Args:
+        text: Reply text of any length
+
+    Returns:
+        At most 5 text message dictionaries
+    """
+    chunks = split_text(text or " ")
+    if len(chunks) > MAX_MESSAGES:
+        logging.warning(f"Reply of {len(text)} chars truncated to {MAX_MESSAGES} messages")
+        chunks = chunks[:MAX_MESSAGES]
+        chunks[-1] = _truncate(chunks[-1], MAX_TEXT_LENGTH)
+    return [{"type": "text", "text": chunk} for chunk in chunks]
+
+
+def _vocabulary_bubble(vocab: Dict[str, str]) -> Dict:
+    contents = [
+        {"type": "text", "text": _truncate(vocab["german"], MAX_BUBBLE_TEXT_LENGTH), "weight": "bold", "size": "lg", "wrap": True},
+        {"type": "text", "text": _truncate(vocab["english"], MAX_BUBBLE_TEXT_LENGTH), "size": "sm", "color": "#555555", "wrap": True},
+        {"type": "text", "text": _truncate(vocab["chinese"], MAX_BUBBLE_TEXT_LENGTH), "size": "sm", "color": "#555555", "wrap": True},
+    ]
+    if vocab.get("sentence"):
+        contents.append({"type": "separator", "margin": "md"})
+        contents.append({
+            "type": "text",
+            "text": _truncate(vocab["sentence"], MAX_BUBBLE_TEXT_LENGTH),
+            "size": "xs",
+            "color": "#888888",
+            "wrap": True,
+            "margin": "md",
+        })
+    return {
+        "type": "bubble",
+        "size": "kilo",
+        "body": {"type": "box", "layout": "vertical", "spacing": "sm", "contents": contents},
+    }
+
+
+def flex_vocabulary_messages(vocabularies: List[Dict[str, str]]) -> List[Dict]:
+    """
+    Render vocabularies as LINE Flex carousels, one card per word.
+
+    Each carousel holds up to 12 cards and a reply up to 5 messages, so at
+    most 60 words are shown.
+
+    Args:
+        vocabularies: List of vocabulary dictionaries
+
+    Returns:
+        Flex message dictionaries
+    """
+    if not vocabularies:
+        return text_messages(format_vocabularies_for_line(vocabularies))
+
+    limit = MAX_CAROUSEL_BUBBLES * MAX_MESSAGES
+    if len(vocabularies) > limit:
+        logging.warning(f"Showing {limit} of {len(vocabularies)} vocabularies")
+        vocabularies = vocabularies[:limit]
+
+    messages = []
+    for start in range(0, len(vocabularies), MAX_CAROUSEL_BUBBLES):
+        chunk = vocabularies[start:start + MAX_CAROUSEL_BUBBLES]
+        # Shown in notifications and on clients without Flex support
+        alt_text = _truncate(
+            f"German vocabularies: {', '.join(vocab['german'] for vocab in chunk)}", MAX_ALT_TEXT_LENGTH
+        )
+        messages.append({
+            "type": "flex",
+            "altText": alt_text,
+            "contents": {"type": "carousel", "contents": [_vocabulary_bubble(vocab) for vocab in chunk]},
+        })
+    return messages
+
+
+def render_vocabulary_messages(vocabularies: List[Dict[str, str]], message_format: str = "flex") -> List[Dict]:
+    """
+    Render vocabularies as a ready-to-send LINE reply.
+
+    Args:
+        vocabularies: List of vocabulary dictionaries
+        message_format: "flex" for carousels, "text" for one plain-text list
+
+    Returns:
+        At most 5 LINE message dictionaries
+    """
+    if message_format == "flex":
+        return flex_vocabulary_messages(vocabularies)
+    return text_messages(format_vocabularies_for_line(vocabularies))
@@ -0,0 +1,282 @@
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers cache hits and DB queries up to slow OpenAI calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Return the sample lines of every series"""
+        pass
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, one series per label combination"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Observing is a bisect and three additions under a lock, cheap enough to
+    wrap every request and downstream call.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(series[0]), series[1], series[2])) for key, series in self._series.items())
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class GaugeCollector(_Metric):
+    """Gauge whose samples are read from a callback at scrape time, e.g. a component's stats()"""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Iterable[str] = (),
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def _samples(self) -> List[str]:
+        values = self.collect()
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class CounterCollector(GaugeCollector):
+    """Counter whose samples are read from a callback, for cumulative values kept by a component"""
+
+    type_name = "counter"
+
+
+class Registry:
+    """Set of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Re-registering (e.g. create_app called twice in tests) keeps the first instance
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "chatbot_http_requests_total", "HTTP requests by endpoint, method and status", ("endpoint", "method", "status")
+))
+HTTP_LATENCY = registry.register(Histogram(
+    "chatbot_http_request_duration_seconds", "HTTP request latency by endpoint", ("endpoint",)
+))
+STAGE_LATENCY = registry.register(Histogram(
+    "chatbot_stage_duration_seconds", "Latency of internal stages (OpenAI, MySQL, scraping, LINE)", ("stage",)
+))
+STAGE_ERRORS = registry.register(Counter(
+    "chatbot_stage_errors_total", "Failed calls per internal stage", ("stage",)
+))
+OPENAI_TOKENS = registry.register(Counter(
+    "chatbot_openai_tokens_total", "Tokens reported by OpenAI by kind", ("kind",)
+))
+OPENAI_RETRIES = registry.register(Counter(
+    "chatbot_openai_retries_total", "Retried OpenAI calls"
+))
+
+
+@contextmanager
+def track_stage(stage: str):
+    """Time a block as `stage` and count it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage=stage)
+
+
+def timed(stage: str):
+    """
+    Decorator recording the latency and failures of a function as `stage`.
+
+    Args:
+        stage: Stage label, e.g. "openai.chat"
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_stats(
+    name: str,
+    documentation: str,
+    stats: Callable[[], Dict[str, float]],
+    label: str = "field",
+    counters: Iterable[str] = (),
+):
+    """
+    Expose a component's stats() dictionary with one series per key.
+
+    Keys listed in `counters` only ever grow (hits, misses, ...) and are
+    exported as the counter `<name>_total`, so rate() works on them; the
+    other keys are exported as the gauge `<name>`.
+
+    Args:
+        name: Metric name
+        documentation: Help text
+        stats: Callable returning numeric values by key
+        label: Label name holding the key
+        counters: Keys holding cumulative counts
+    """
+    counters = frozenset(counters)
+
+    def collect(cumulative: bool) -> Dict[Tuple[str, ...], float]:
+        return {
+            (key,): value for key, value in stats().items()
+            if isinstance(value, (int, float)) and (key in counters) == cumulative
+        }
+
+    registry.register(GaugeCollector(name, documentation, lambda: collect(False), (label,)))
+    if counters:
+        registry.register(CounterCollector(f"{name}_total", documentation, lambda: collect(True), (label,)))
+
+
+def observe_openai_usage(usage: Optional[dict]):
+    """Count the prompt and completion tokens of an OpenAI response"""
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            OPENAI_TOKENS.inc(usage[kind], kind=kind.split("_")[0])
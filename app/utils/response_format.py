@@ -66,18 +66,15 @@ def format_vocabularies_for_line(vocabularies: List[Dict[str, str]]) -> str:
     if not vocabularies:
         return "Sorry, no vocabularies found."
 
-    message = f"Found {len(vocabularies)} German vocabularies:\n\n"
-
+    entries = []
     for i, vocab in enumerate(vocabularies, 1):
-        message += f"{i}. {vocab['german']}\n"
-        message += f"{vocab['english']}\n"
-        message += f"{vocab['chinese']}\n"
+        lines = [f"{i}. {vocab['german']}", vocab['english'], vocab['chinese']]
         if vocab.get('sentence'):
             # Truncate long sentences
             sentence = vocab['sentence']
             if len(sentence) > 100:
                 sentence = sentence[:97] + "..."
-            message += f"{sentence}\n"
-        message += "\n"
+            lines.append(sentence)
+        entries.append("\n".join(lines))
 
-    return message.strip()
+    return f"Found {len(vocabularies)} German vocabularies:\n\n" + "\n\n".join(entries)
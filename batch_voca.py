@@ -0,0 +1,27 @@
+import argparse
+import logging
+
+from app.services.batch_job import BatchJob, load_articles
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate and save vocabularies for a corpus of articles")
+    parser.add_argument("input", help="JSON or JSONL file of articles (strings or objects with 'text' and optional 'id')")
+    parser.add_argument("--concurrency", type=int, help="Articles processed at once (default: BATCH_CONCURRENCY)")
+    parser.add_argument("--rpm", type=float, help="Maximum articles started per minute (default: BATCH_REQUESTS_PER_MINUTE)")
+    parser.add_argument("--progress", help="Progress file; finished articles listed here are skipped on the next run")
+    parser.add_argument("--output", help="JSONL file receiving each article's vocabularies")
+    parser.add_argument("--flush-size", type=int, default=200, help="Vocabularies buffered before each bulk DB write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    job = BatchJob(
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        flush_size=args.flush_size,
+        progress_path=args.progress or f"{args.input}.progress",
+        output_path=args.output,
+        keep_results=False,
+    )
+    job.run(load_articles(args.input))
+    print(job.summary)
@@ -0,0 +1,275 @@
+"""
+End-to-end load test of the Flask app against local fake services.
+
+Starts fake OpenAI, LINE and news servers (see fakes.py), points the app at
+them through environment variables, serves create_app() with waitress and
+drives each endpoint with concurrent clients:
+
+- callback: correctly signed LINE text-message webhooks
+- gen_voca: vocabulary extraction for distinct generated articles
+- pushnews: scrape, vocabulary pre-computation and LINE fan-out
+
+For every scenario it prints p50/p95/p99 latency and throughput. For
+/callback, which answers before doing any work, it also reports how long the
+worker pool took to deliver all replies to the fake LINE server. MySQL is
+disabled (DB_ENABLED=False) so the run needs no database.
+
+Usage:
+    python benchmarks/bench_e2e.py [--requests 200] [--concurrency 20]
+        [--scenarios callback,gen_voca,pushnews] [--openai-latency 0.5]
+        [--rate-limit-ratio 0.05] [--save-baseline benchmarks/baseline.json]
+        [--compare benchmarks/baseline.json] [--tolerance 0.15]
+
+Exit status is 1 when --compare finds a regression beyond the tolerance.
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import FakeLine, FakeNewsSite, FakeOpenAI, load_words  # noqa: E402
+
+CHANNEL_SECRET = "bench-channel-secret"
+ANALYZER_KEY = "bench-analyzer-key"
+SCENARIOS = ("callback", "gen_voca", "pushnews")
+
+
+def configure_environment(openai_url: str, line_url: str, news_url: str, args):
+    """Point the app at the fakes; must run before anything under app/ is imported"""
+    os.environ.update({
+        "DB_ENABLED": "False",
+        "SCHEDULER_ENABLED": "False",
+        "FEATURE_ANALYZER_ENABLED": "True",
+        "APP_ANALYZER_KEY": ANALYZER_KEY,
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_API_BASE": f"{openai_url}/v1",
+        "OPENAI_LANG_MODEL": "gpt-bench",
+        "LINE_ACCESS_TOKEN": "bench-token",
+        "LINE_CHANNEL_SECRET": CHANNEL_SECRET,
+        "LINE_USER_ID": "Ubench",
+        "LINE_API_ENDPOINT": line_url,
+        "NEWS_SCRAPER_TYPE": "ts_learn_german",
+        "NEWS_REQUEST_URL": f"{news_url}/wissen",
+        "NEWS_SOURCES": "",
+        "VOCA_CACHE_SQLITE_PATH": "",
+        "LINE_WORKER_THREADS": str(args.workers),
+        "LINE_EVENT_QUEUE_SIZE": str(max(args.requests, 100)),
+    })
+
+
+def start_app(threads: int):
+    """Serve create_app() with waitress on an ephemeral port"""
+    from waitress.server import create_server
+
+    from app import create_app
+
+    server = create_server(create_app(), host="127.0.0.1", port=0, threads=threads)
+    threading.Thread(target=server.run, name="waitress", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.effective_port}"
+
+
+def sign(body: bytes) -> str:
+    digest = hmac.new(CHANNEL_SECRET.encode("utf-8"), body, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("utf-8")
+
+
+def callback_request(i: int, words):
+    event = {
+        "type": "message",
+        "mode": "active",
+        "timestamp": int(time.time() * 1000),
+        "source": {"type": "user", "userId": f"Ubench{i % 50}"},
+        "webhookEventId": f"bench-{i}",
+        "deliveryContext": {"isRedelivery": False},
+        "replyToken": f"reply-{i}",
+        "message": {"id": str(i), "type": "text", "quoteToken": f"q-{i}", "text": f"Was bedeutet {random.choice(words)}?"},
+    }
+    body = json.dumps({"destination": "Ubot", "events": [event]}).encode("utf-8")
+    return "POST", "/callback", body, {"Content-Type": "application/json", "X-Line-Signature": sign(body)}
+
+
+def gen_voca_request(i: int, words):
+    rng = random.Random(i)
+    text = " ".join(rng.choice(words).capitalize() if n % 3 == 0 else rng.choice(words) for n in range(200)) + "."
+    body = json.dumps({"text": text}).encode("utf-8")
+    return "POST", "/gen_voca", body, {"Content-Type": "application/json", "Analyzer-Signature": "bench"}
+
+
+def pushnews_request(i: int, words):
+    return "GET", "/pushnews", None, {}
+
+
+REQUEST_BUILDERS = {
+    "callback": callback_request,
+    "gen_voca": gen_voca_request,
+    "pushnews": pushnews_request,
+}
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(base_url: str, name: str, total: int, concurrency: int, words):
+    """Send `total` requests with `concurrency` clients; returns the scenario's stats"""
+    build = REQUEST_BUILDERS[name]
+    requests_ = [build(i, words) for i in range(total)]
+    local = threading.local()
+
+    def send(request):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, body, headers = request
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, data=body, headers=headers, timeout=120)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, requests_))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "elapsed_s": elapsed,
+    }
+
+
+def wait_for_deliveries(line: FakeLine, expected: int, started: float, timeout: float = 300):
+    """Wait until the fake LINE server got `expected` replies/pushes; returns seconds since `started`"""
+    deadline = time.monotonic() + timeout
+    while line.delivered() < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return time.perf_counter() - started
+
+
+def print_results(results: dict):
+    print(f"{'scenario':<10} {'reqs':>6} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in results.items():
+        print(
+            f"{name:<10} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+        if "delivered_rps" in stats:
+            print(f"{'':<10} all replies delivered after {stats['delivery_s']:.2f}s ({stats['delivered_rps']:.1f}/s)")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the change against a baseline; returns True if anything regressed beyond `tolerance`"""
+    regressed = False
+    print(f"\nCompared with baseline (tolerance {tolerance:.0%}):")
+    for name, stats in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            print(f"  {name}: no baseline")
+            continue
+        for metric, higher_is_better in (("p50_ms", False), ("p95_ms", False), ("p99_ms", False), ("throughput_rps", True)):
+            old, new = before.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > tolerance else ""
+            regressed |= bool(flag)
+            print(f"  {name:<10} {metric:<15} {old:>9.1f} -> {new:>9.1f} ({change:+.1%}) {flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--pushnews-requests", type=int, default=20, help="Requests for the (slow) pushnews scenario")
+    parser.add_argument("--threads", type=int, default=8, help="waitress worker threads (like gunicorn --threads)")
+    parser.add_argument("--workers", type=int, default=4, help="LINE event worker threads")
+    parser.add_argument("--openai-latency", type=float, default=0.5, help="Mean fake OpenAI latency in seconds")
+    parser.add_argument("--openai-jitter", type=float, default=0.1, help="Standard deviation of the fake OpenAI latency")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Share of OpenAI calls answered with 429")
+    parser.add_argument("--line-latency", type=float, default=0.05, help="Fake LINE API latency in seconds")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare the results with this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression for --compare")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    openai_fake = FakeOpenAI(args.openai_latency, args.openai_jitter, args.rate_limit_ratio).start()
+    line_fake = FakeLine(args.line_latency).start()
+    news_fake = FakeNewsSite().start()
+    configure_environment(openai_fake.url, line_fake.url, news_fake.url, args)
+
+    import logging
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    # Queue depth warnings are expected: the point is to saturate the worker threads
+    logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+
+    server, base_url = start_app(args.threads)
+    words = load_words()
+
+    results = {}
+    for name in scenarios:
+        total = args.pushnews_requests if name == "pushnews" else args.requests
+        print(f"Running {name}: {total} requests, concurrency {args.concurrency}...")
+        delivered_before = line_fake.delivered()
+        started = time.perf_counter()
+        stats = run_scenario(base_url, name, total, args.concurrency, words)
+        if name == "callback":
+            stats["delivery_s"] = wait_for_deliveries(line_fake, delivered_before + total, started)
+            stats["delivered_rps"] = total / stats["delivery_s"]
+        results[name] = stats
+
+    print()
+    print_results(results)
+    print(f"\nFake OpenAI calls: {dict(openai_fake.calls)}; LINE calls: {dict(line_fake.calls)}")
+    server.close()
+
+    if args.save_baseline:
+        payload = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args), "results": results}
+        Path(args.save_baseline).write_text(json.dumps(payload, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
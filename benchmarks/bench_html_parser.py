@@ -0,0 +1,80 @@
+"""
+Micro-benchmark for the scraper HTML parsing path.
+
+Compares the original approach (decode to str, full html.parser tree,
+teaser lookup done twice) with the current one (raw bytes, SoupStrainer,
+lxml when installed) on the saved Tagesschau-like fixtures.
+
+Usage:
+    python benchmarks/bench_html_parser.py [--rounds 50]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.scrapers.html_parser import PARSER, parse_html  # noqa: E402
+from app.services.scrapers.ts_learn_german import PARAGRAPH_STRAINER, TEASER_STRAINER  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def baseline_list(content: bytes):
+    soup = BeautifulSoup(content.decode("utf-8"), "html.parser")
+    link = soup.find("a", class_="teaser__link").get("href")
+    title = soup.find("a", class_="teaser__link").select_one(".teaser__headline").text
+    return link, title
+
+
+def baseline_article(content: bytes):
+    soup = BeautifulSoup(content.decode("utf-8"), "html.parser")
+    return "\n".join(p.get_text() for p in soup.find_all("p", class_="textabsatz"))
+
+
+def strained_list(content: bytes, parser: str = None):
+    soup = parse_html(content, parse_only=TEASER_STRAINER, parser=parser)
+    teaser = soup.find("a", class_="teaser__link")
+    return teaser.get("href"), teaser.select_one(".teaser__headline").text
+
+
+def strained_article(content: bytes, parser: str = None):
+    soup = parse_html(content, parse_only=PARAGRAPH_STRAINER, parser=parser)
+    return "\n".join(p.get_text() for p in soup.find_all("p", class_="textabsatz"))
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    seconds = min(timeit.repeat(fn, number=rounds, repeat=3)) / rounds
+    print(f"  {label:<40} {seconds * 1000:8.2f} ms")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    list_page = (FIXTURES / "ts_list.html").read_bytes()
+    article_page = (FIXTURES / "ts_article.html").read_bytes()
+
+    # The optimized path must extract exactly what the original one did
+    assert baseline_list(list_page) == strained_list(list_page)
+    assert baseline_article(article_page) == strained_article(article_page)
+
+    print(f"Default backend: {PARSER}")
+    for name, page, baseline, strained in (
+        ("list page", list_page, baseline_list, strained_list),
+        ("article page", article_page, baseline_article, strained_article),
+    ):
+        print(f"{name} ({len(page) / 1024:.0f} KiB):")
+        before = bench("html.parser, full tree (baseline)", lambda: baseline(page), args.rounds)
+        bench("html.parser, strained bytes", lambda: strained(page, "html.parser"), args.rounds)
+        after = bench(f"{PARSER}, strained bytes (current)", lambda: strained(page), args.rounds)
+        print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Local stand-ins for the services the bot talks to, used by bench_e2e.py.
+
+- FakeOpenAI: /v1/chat/completions with configurable latency and 429 rate.
+  Vocabulary prompts get a valid JSON array built from the article's words,
+  everything else gets a short answer.
+- FakeLine: the Messaging API reply/push/multicast endpoints; counts calls.
+- FakeNewsSite: a Tagesschau-like list page whose teasers move on with every
+  request, and article pages with generated German paragraphs.
+
+Each fake is a ThreadingHTTPServer on 127.0.0.1 running in a daemon thread.
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+WORDS_PATH = Path(__file__).resolve().parent.parent / "app" / "data" / "german_frequency.txt"
+
+
+def load_words():
+    with open(WORDS_PATH, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.fake.handle(self, "GET", self.path, b"")
+
+    def do_POST(self):
+        self.fake.handle(self, "POST", self.path, self._read_body())
+
+
+class FakeServer:
+    """Base class: serves `handle` on an ephemeral port in a background thread"""
+
+    def __init__(self):
+        handler = type(f"{type(self).__name__}Handler", (_Handler,), {"fake": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str):
+        with self._lock:
+            self.calls[key] += 1
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, request: _Handler, method: str, path: str, body: bytes):
+        raise NotImplementedError
+
+
+class FakeOpenAI(FakeServer):
+    """Chat completions endpoint with latency ~ N(latency, jitter) and a share of 429 responses"""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.1, rate_limit_ratio: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+
+    def handle(self, request, method, path, body):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            request._send(404, b'{"error": {"message": "not found"}}')
+            return
+
+        if random.random() < self.rate_limit_ratio:
+            self.count("429")
+            request._send(
+                429,
+                json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}).encode(),
+                headers={"Retry-After": "0.05"},
+            )
+            return
+
+        payload = json.loads(body)
+        time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+        prompt = payload["messages"][-1]["content"]
+
+        if "vocabulary items" in prompt:
+            self.count("vocabularies")
+            content = json.dumps(self._vocabularies(prompt), ensure_ascii=False)
+        else:
+            self.count("chat")
+            content = "Das ist eine kurze Antwort auf deine Frage."
+
+        prompt_tokens = sum(len(m.get("content", "")) for m in payload["messages"]) // 3
+        completion_tokens = len(content) // 3
+        response = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        request._send(200, json.dumps(response, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _vocabularies(prompt: str):
+        match = re.search(r"exactly (\d+) vocabulary items", prompt)
+        count = int(match.group(1)) if match else 10
+        words = list(dict.fromkeys(w for w in re.findall(r"\b[A-ZÄÖÜ][a-zäöüß]{5,}\b", prompt)))
+        while len(words) < count:
+            words.append(f"Beispielwort{len(words)}")
+        return [
+            {
+                "german": word,
+                "english": f"{word.lower()} (en)",
+                "chinese": f"{word.lower()} (zh)",
+                "sentence": f"Der Satz enthält das Wort {word}.",
+            }
+            for word in words[:count]
+        ]
+
+
+class FakeLine(FakeServer):
+    """LINE Messaging API: accepts reply, push and multicast with a small fixed latency"""
+
+    def __init__(self, latency: float = 0.05):
+        super().__init__()
+        self.latency = latency
+
+    def handle(self, request, method, path, body):
+        time.sleep(self.latency)
+        self.count(path.rstrip("/").rsplit("/", 1)[-1])
+        request._send(200, b"{}")
+
+    def delivered(self) -> int:
+        """Number of reply and push calls received so far"""
+        with self._lock:
+            return self.calls["reply"] + self.calls["push"]
+
+
+class FakeNewsSite(FakeServer):
+    """
+    Tagesschau-like site.
+
+    /wissen lists `teasers` articles; every list request starts one article
+    further on, so repeated pushes always find an unseen article, as on a
+    live news site. /wissen/artikel-<n>.html returns generated paragraphs.
+    """
+
+    def __init__(self, teasers: int = 20, paragraphs: int = 8, latency: float = 0.02):
+        super().__init__()
+        self.teasers = teasers
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.words = load_words()
+        self._next_article = 0
+
+    def handle(self, request, method, path, body):
+        time.sleep(self.latency)
+        if path == "/wissen":
+            self.count("list")
+            with self._lock:
+                first = self._next_article
+                self._next_article += 1
+            request._send(200, self._list_page(first), "text/html; charset=utf-8")
+            return
+
+        match = re.match(r"^/wissen/artikel-(\d+)\.html$", path)
+        if match:
+            self.count("article")
+            request._send(200, self._article_page(int(match.group(1))), "text/html; charset=utf-8")
+            return
+        request._send(404, b"not found", "text/plain")
+
+    def _headline(self, number: int) -> str:
+        rng = random.Random(number)
+        return " ".join(rng.choice(self.words).capitalize() for _ in range(5))
+
+    def _list_page(self, first: int) -> bytes:
+        teasers = "".join(
+            f'<div class="teaser"><a class="teaser__link" href="/wissen/artikel-{n}.html">'
+            f'<span class="teaser__topline">Wissen</span>'
+            f'<span class="teaser__headline">{self._headline(n)}</span></a></div>'
+            for n in range(first, first + self.teasers)
+        )
+        return f'<!DOCTYPE html><html lang="de"><body><main>{teasers}</main></body></html>'.encode("utf-8")
+
+    def _article_page(self, number: int) -> bytes:
+        rng = random.Random(number)
+        paragraphs = "".join(
+            '<p class="textabsatz columns twelve m-ten m-offset-one l-eight l-offset-two">'
+            + " ".join(rng.choice(self.words).capitalize() if i % 4 == 0 else rng.choice(self.words) for i in range(40))
+            + ".</p>"
+            for _ in range(self.paragraphs)
+        )
+        return (
+            f'<!DOCTYPE html><html lang="de"><body><article><h1>{self._headline(number)}</h1>'
+            f"{paragraphs}</article></body></html>"
+        ).encode("utf-8")
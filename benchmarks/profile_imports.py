@@ -0,0 +1,95 @@
+"""
+Import-time profile of worker boot.
+
+Runs `from app import create_app; create_app()` in a fresh interpreter under
+`python -X importtime` and prints the slowest modules by cumulative import
+time, the total boot time and which heavy SDKs were loaded at boot. MySQL and
+the scheduler are disabled so the run needs no services.
+
+Usage:
+    python benchmarks/profile_imports.py [--top 25] [--runs 5] [--budget-ms 500]
+
+Exit status is 1 when the median boot time exceeds --budget-ms.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded on first use; seeing one here means something imports it eagerly again
+HEAVY_MODULES = ("openai", "aiohttp", "linebot", "requests", "bs4", "lxml", "pymysql")
+
+BOOT_CODE = """
+import sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+print("BOOT_MS", (time.perf_counter() - started) * 1000)
+print("LOADED", ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_boot(importtime: bool):
+    env = dict(os.environ, DB_ENABLED="False", SCHEDULER_ENABLED="False", WARMUP_ON_START="False")
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", BOOT_CODE.format(heavy=HEAVY_MODULES)]
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+    boot_ms, loaded = 0.0, []
+    for line in result.stdout.splitlines():
+        if line.startswith("BOOT_MS "):
+            boot_ms = float(line.split()[1])
+        elif line.startswith("LOADED "):
+            loaded = [name for name in line[len("LOADED "):].split(",") if name]
+    return boot_ms, loaded, result.stderr
+
+
+def parse_importtime(stderr: str):
+    """Return (module, self_us, cumulative_us, depth) for every imported module"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25, help="Modules to list")
+    parser.add_argument("--runs", type=int, default=5, help="Boots to time; the median is reported")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median boot time is above this")
+    args = parser.parse_args()
+
+    # First boot also writes the .pyc files; it is profiled but not timed
+    _, loaded, stderr = run_boot(importtime=True)
+    rows = parse_importtime(stderr)
+    boot_times = [run_boot(importtime=False)[0] for _ in range(args.runs)]
+    median = statistics.median(boot_times)
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us, depth in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+    top_level = sum(cumulative_us for _, _, cumulative_us, depth in rows if depth == 0)
+    print(f"\n{len(rows)} modules, {top_level / 1000:.1f} ms importing (profiled run)")
+    print(f"create_app() boot: median {median:.1f} ms over {args.runs} runs (min {min(boot_times):.1f} ms)")
+    print(f"Heavy SDKs loaded at boot: {', '.join(loaded) or 'none'}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"Boot time {median:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+import logging
+
+from app import config
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Prepare (and optionally push) the daily news digest on a schedule")
+    parser.add_argument("--now", action="store_true", help="Prepare the digest once and exit instead of running the scheduler")
+    parser.add_argument("--push", action="store_true", help="With --now, also push the digest to all subscribers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.now:
+        from app.services.news_digest import prepare_digest, push_digest
+        result = push_digest() if args.push else prepare_digest()
+        if result is None:
+            raise SystemExit("Failed to prepare the news digest")
+    else:
+        if config.DB_ENABLED:
+            from app.services.known_words import known_words_index
+            known_words_index.warm_up_async()
+
+        # Runs in the foreground; use this instead of SCHEDULER_ENABLED when the web app has several workers
+        from app.services.scheduler import get_scheduler
+        get_scheduler().run_forever()
@@ -0,0 +1,9 @@
+-- CREATE TABLE
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(64) NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_conversation_messages_user (user_id, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,8 @@
+-- CREATE TABLE
+CREATE TABLE IF NOT EXISTS news_digests (
+    digest_date DATE PRIMARY KEY,
+    payload MEDIUMTEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    KEY idx_news_digests_updated (updated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
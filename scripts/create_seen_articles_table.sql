@@ -0,0 +1,12 @@
+-- CREATE TABLE
+-- URLs can be long, so the primary key is their SHA-256
+CREATE TABLE IF NOT EXISTS seen_articles (
+    url_hash CHAR(64) PRIMARY KEY,
+    url VARCHAR(2048) NOT NULL,
+    teaser_hash CHAR(64) NOT NULL,
+    content_hash CHAR(64),
+    pushed TINYINT(1) NOT NULL DEFAULT 0,
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    KEY idx_seen_articles_updated (updated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
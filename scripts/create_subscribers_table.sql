@@ -0,0 +1,20 @@
+-- CREATE TABLE
+CREATE TABLE IF NOT EXISTS subscribers (
+    user_id VARCHAR(64) PRIMARY KEY,
+    active TINYINT(1) NOT NULL DEFAULT 1,
+    subscribed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    KEY idx_subscribers_active (active)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- One row per recipient of every fan-out
+CREATE TABLE IF NOT EXISTS deliveries (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    batch_id VARCHAR(36) NOT NULL,
+    user_id VARCHAR(64) NOT NULL,
+    status VARCHAR(16) NOT NULL,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_deliveries_batch (batch_id),
+    KEY idx_deliveries_user (user_id, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
\ No newline at end of file
@@ -1,8 +1,33 @@
+-- Index every word: InnoDB's default stopword list would silently drop e.g. "und" or "die"
+SET SESSION innodb_ft_enable_stopword = OFF;
+
 -- CREATE TABLE
 CREATE TABLE IF NOT EXISTS vocabularies (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    german VARCHAR(200) NOT NULL,
+    -- Binary collation: words that differ only in case or accents (Zahlen/zahlen, schon/schön) are different words
+    german VARCHAR(200) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
     english TEXT,
     chinese TEXT,
-    sentence TEXT
+    sentence TEXT,
+    UNIQUE KEY uq_vocabularies_german (german),
+    -- One full-text index per column: german's collation differs, and Chinese has no spaces
+    -- between words, so it is split into n-grams (ngram_token_size, 2 by default) instead
+    FULLTEXT KEY ft_vocabularies_german (german),
+    FULLTEXT KEY ft_vocabularies_english (english),
+    FULLTEXT KEY ft_vocabularies_chinese (chinese) WITH PARSER ngram
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Spaced-repetition state of every word a user has reviewed
+CREATE TABLE IF NOT EXISTS vocabulary_reviews (
+    user_id VARCHAR(64) NOT NULL,
+    vocabulary_id INT NOT NULL,
+    repetitions INT NOT NULL DEFAULT 0,
+    interval_days INT NOT NULL DEFAULT 0,
+    ease_factor DECIMAL(4,2) NOT NULL DEFAULT 2.50,
+    due_at DATETIME NOT NULL,
+    last_reviewed_at DATETIME NOT NULL,
+    PRIMARY KEY (user_id, vocabulary_id),
+    KEY idx_vocabulary_reviews_due (user_id, due_at, vocabulary_id),
+    CONSTRAINT fk_vocabulary_reviews_vocabulary FOREIGN KEY (vocabulary_id)
+        REFERENCES vocabularies (id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
\ No newline at end of file
@@ -0,0 +1,37 @@
+-- Add a unique key on vocabularies.german so saves stop piling up duplicates.
+--
+-- german is switched to the utf8mb4_bin collation first. The table default
+-- (utf8mb4_0900_ai_ci on MySQL 8) ignores case and accents, which would make
+-- schon/schön or zahlen/Zahlen one word. Only exact duplicates are collapsed,
+-- keeping the first inserted row per word like Database.save_vocabularies
+-- does, and every removed row is copied to vocabularies_duplicates_backup first.
+
+ALTER TABLE vocabularies
+    MODIFY german VARCHAR(200) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL;
+
+-- Report the words that have duplicates and how many rows will be removed
+SELECT german, COUNT(*) - 1 AS rows_to_remove
+FROM vocabularies
+GROUP BY german
+HAVING COUNT(*) > 1
+ORDER BY german;
+
+CREATE TABLE IF NOT EXISTS vocabularies_duplicates_backup LIKE vocabularies;
+
+INSERT INTO vocabularies_duplicates_backup
+SELECT newer.*
+FROM vocabularies AS newer
+WHERE EXISTS (
+    SELECT 1 FROM vocabularies AS older
+    WHERE older.german = newer.german
+      AND older.id < newer.id
+);
+
+DELETE newer
+FROM vocabularies AS newer
+JOIN vocabularies AS older
+    ON older.german = newer.german
+   AND older.id < newer.id;
+
+ALTER TABLE vocabularies
+    ADD UNIQUE KEY uq_vocabularies_german (german);
@@ -0,0 +1,27 @@
+-- Full-text search over vocabularies and per-user spaced-repetition reviews.
+-- Prefix search on german uses the existing uq_vocabularies_german index.
+
+-- Index every word: InnoDB's default stopword list would silently drop e.g. "und" or "die".
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+-- One index per column: german uses a binary collation (see 001), and Chinese has no
+-- spaces between words, so it is split into n-grams instead. Words shorter than the
+-- server's innodb_ft_min_token_size (3 by default) are not indexed; see the README.
+ALTER TABLE vocabularies
+    ADD FULLTEXT KEY ft_vocabularies_german (german),
+    ADD FULLTEXT KEY ft_vocabularies_english (english),
+    ADD FULLTEXT KEY ft_vocabularies_chinese (chinese) WITH PARSER ngram;
+
+CREATE TABLE IF NOT EXISTS vocabulary_reviews (
+    user_id VARCHAR(64) NOT NULL,
+    vocabulary_id INT NOT NULL,
+    repetitions INT NOT NULL DEFAULT 0,
+    interval_days INT NOT NULL DEFAULT 0,
+    ease_factor DECIMAL(4,2) NOT NULL DEFAULT 2.50,
+    due_at DATETIME NOT NULL,
+    last_reviewed_at DATETIME NOT NULL,
+    PRIMARY KEY (user_id, vocabulary_id),
+    KEY idx_vocabulary_reviews_due (user_id, due_at, vocabulary_id),
+    CONSTRAINT fk_vocabulary_reviews_vocabulary FOREIGN KEY (vocabulary_id)
+        REFERENCES vocabularies (id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,20 @@
+from app.services.known_words import KnownWordsIndex
+
+
+def test_article_text_words_match_saved_nouns_with_their_article():
+    index = KnownWordsIndex()
+    index.add(["die Energiewende", "das Gesetz", "zahlen"])
+
+    assert index.contains("Energiewende")
+    assert index.contains("die Energiewende")
+    assert index.contains("Gesetzes")
+    assert index.contains("energiewende")
+    assert not index.contains("Zahl")
+
+
+def test_filter_unknown_uses_the_same_key():
+    index = KnownWordsIndex()
+    index.add(["die Energiewende"])
+
+    vocabularies = [{"german": "Energiewende"}, {"german": "der Wandel"}]
+    assert index.filter_unknown(vocabularies) == [{"german": "der Wandel"}]
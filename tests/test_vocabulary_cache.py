@@ -0,0 +1,33 @@
+from unittest import mock
+
+import pytest
+
+from app.routes import webhook
+from app.services import openai_service
+from app.services.vocabulary_cache import vocabulary_cache
+
+ARTICLE = "Die Bundesregierung beschließt ein neues Gesetz zur Energiewende."
+VOCAB = {"german": "die Energiewende", "english": "energy transition", "chinese": "能源转型", "sentence": ARTICLE}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    vocabulary_cache.clear()
+    yield
+    vocabulary_cache.clear()
+
+
+def test_vocabulary_cache_is_shared_with_and_without_candidates():
+    with mock.patch.object(openai_service, "_request_vocabularies", return_value=[VOCAB]) as request:
+        openai_service.extract_vocabularies(ARTICLE, candidates=["Energiewende"], prompt_text=ARTICLE)
+        openai_service.extract_vocabularies(ARTICLE)
+    assert request.call_count == 1
+
+
+def test_repeated_line_replies_count_as_hits():
+    with mock.patch.object(openai_service, "_request_vocabularies", return_value=[VOCAB]):
+        for _ in range(3):
+            webhook.vocabulary_reply(ARTICLE)
+
+    stats = vocabulary_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from app.services import openai_service
+from app.services.vocabulary_parser import VocabularyStreamParser, parse_vocabularies
+
+HAUS = '{"german": "das Haus", "english": "house", "chinese": "房子", "sentence": "Das Haus ist alt."}'
+DACH = '{"german": "das Dach", "english": "roof", "chinese": "屋顶", "sentence": "Das Dach ist neu."}'
+
+
+def _words(vocabularies):
+    return [vocab["german"] for vocab in vocabularies]
+
+
+def test_truncated_wrapped_reply_keeps_complete_items():
+    vocabularies, rejected = parse_vocabularies('{"vocabularies": [' + HAUS + ", " + DACH + ', {"german": "der')
+    assert _words(vocabularies) == ["das Haus", "das Dach"]
+    assert rejected == 0
+
+
+def test_truncated_wrapped_reply_fed_in_pieces():
+    text = '```json\n{"vocabularies": [' + HAUS + ", " + DACH + ', {"ger'
+    parser = VocabularyStreamParser()
+    found = []
+    for i in range(0, len(text), 4):
+        found += parser.feed(text[i:i + 4])
+    assert _words(found) == ["das Haus", "das Dach"]
+
+
+def test_complete_wrapped_and_plain_arrays():
+    assert _words(parse_vocabularies('{"vocabularies": [' + HAUS + "]}")[0]) == ["das Haus"]
+    assert _words(parse_vocabularies("[" + HAUS + ", " + DACH + "]")[0]) == ["das Haus", "das Dach"]
+
+
+def test_failed_repair_call_keeps_recovered_items():
+    first_reply = parse_vocabularies("[" + HAUS + ", " + DACH + ", {")[0]
+    calls = [first_reply, TimeoutError("OpenAI timed out")]
+
+    def call(prompt):
+        result = calls.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with mock.patch.object(openai_service, "_call_vocabularies", side_effect=call), \
+            mock.patch.object(openai_service.config, "VOCA_REPAIR_ATTEMPTS", 2):
+        vocabularies = openai_service._request_vocabularies("Text", "B2-C1", 5)
+    assert _words(vocabularies) == ["das Haus", "das Dach"]
@@ -0,0 +1,16 @@
+from app.services.vocabulary_pipeline import merge_vocabularies
+
+TEXT = "Das Gesetz kommt. Die Energiewende braucht neue Gesetze, sagt der Text des Gesetzes. Ein Haus."
+
+
+def test_nouns_with_articles_rank_by_their_count_in_the_text():
+    results = [[{"german": "die Energiewende"}, {"german": "das Gesetz"}]]
+
+    assert [vocab["german"] for vocab in merge_vocabularies(results, TEXT, 2)] == ["das Gesetz", "die Energiewende"]
+
+
+def test_words_with_and_without_article_are_merged():
+    results = [[{"german": "das Haus"}, {"german": "die Energiewende"}], [{"german": "Haus"}]]
+
+    merged = merge_vocabularies(results, TEXT, 5)
+    assert [vocab["german"] for vocab in merged] == ["das Haus", "die Energiewende"]
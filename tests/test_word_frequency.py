@@ -0,0 +1,29 @@
+from app.services.word_frequency import STOPWORDS, get_frequency_index
+
+
+def test_b2_keeps_rarer_indexed_words_as_ranked_candidates():
+    index = get_frequency_index()
+    threshold = index.level_threshold("B2-C1")
+    assert 0 < threshold < len(index)
+
+    words = [word for word in index._words if len(word) >= 5 and word not in STOPWORDS]
+    common = [word for word in words if index.rank(word) < threshold][:3]
+    rarer = [word for word in words if index.rank(word) >= threshold][:5]
+    assert common and rarer
+
+    text = " ".join(word.capitalize() for word in common + rarer) + "."
+    selected = [word.lower() for word, _ in index.select_candidates(text, "B2-C1", limit=20)]
+
+    assert set(rarer) <= set(selected)
+    assert not set(common) & set(selected)
+    assert all(index.rank(word) is not None for word in selected)
+
+
+
+def test_names_and_acronyms_are_not_candidates():
+    text = ("Die Regierung beschließt mit Olaf Scholz in Brüssel ein Klimagesetz zur Energiewende. "
+            "Scholz sagte, die Digitalisierung sei wichtig für NATO und McDonalds.")
+    selected = {word for word, _ in get_frequency_index().select_candidates(text, "B2-C1", limit=30)}
+
+    assert {"Klimagesetz", "Energiewende", "Digitalisierung"} <= selected
+    assert not {"Scholz", "Brüssel", "NATO", "McDonalds"} & selected